@@ -1,15 +1,136 @@
 """Analysis objects for performing SNDAQ SICO analysis
 """
 import numpy as np
+from numba import njit, prange
 from configparser import ConfigParser
 import ast  # TODO: Replace with pyyaml
-from sndaq.buffer import windowbuffer
+from sndaq.buffer import ringbuffer
 from sndaq.trigger import PrimaryTrigger, Trigger, FastResponseTrigger
 from sndaq.logger import get_logger
 from sndaq.util import datetime64_to_utime, utime_to_datetime64
 
 logger = get_logger()
 
+# Analysis members holding buffer indices of the bins added to/subtracted from sums, in update order
+_sum_regions = ('idx_addbgl', 'idx_subbgl', 'idx_addbgt', 'idx_subbgt', 'idx_addsw', 'idx_subsw')
+
+
+# Compiled eagerly at import from an explicit signature (and cached to disk), so the first update does not stall on JIT
+#   Analyses are spread over threads by prange, and the GIL is released so other Python threads are not blocked
+@njit('void(int64[:, ::1], int64, int64, int64[::1], int64[:, ::1], int64[::1], '
+      'int64[:, ::1], int64[:, ::1], int64[:, ::1])', parallel=True, nogil=True, cache=True)
+def _update_sums_kernel(cum, base, mask, idx_ana, idx_edges, n_rebin, hit_sum, hit_sum2, rate):
+    """Update SICO sums of a set of analyses
+
+    Each rebinned bin is the difference of two rows of the running sum of the analysis buffer, so only two rows are read
+    per bin whatever the rebin factor.
+
+    Parameters
+    ----------
+    cum : numpy.ndarray
+        (buflen, ndom) ring storage of the running sum of the analysis buffer, see sndaq.buffer.ringbuffer
+    base : int
+        Offset of logical buffer row 0 from the physical ring row 0, i.e. head - size
+    mask : int
+        Ring index mask, buflen - 1
+    idx_ana : numpy.ndarray
+        Indices of the analyses to update
+    idx_edges : numpy.ndarray
+        (region, n_analyses) logical buffer row following the last bin to add/subtract, see _sum_regions
+    n_rebin : numpy.ndarray
+        (n_analyses,) rebin factor of each analysis
+    hit_sum, hit_sum2, rate : numpy.ndarray
+        (n_analyses, ndom) analysis sums, updated in-place
+    """
+    n_regions = idx_edges.shape[0]
+    ndom = cum.shape[1]
+    for i in prange(idx_ana.size):
+        a = idx_ana[i]
+        # Bin [edge - rebin_factor, edge) is the running sum at row edge - 1 less that at row edge - rebin_factor - 1
+        # During startup rows not yet written have a running sum of zero, so their bins are zero
+        row_hi = np.empty(n_regions, dtype=np.int64)
+        row_lo = np.empty(n_regions, dtype=np.int64)
+        for r in range(n_regions):
+            row_hi[r] = (base + idx_edges[r, a] - 1) & mask
+            row_lo[r] = (base + idx_edges[r, a] - n_rebin[a] - 1) & mask
+
+        for d in range(ndom):
+            bin_addbgl = cum[row_hi[0], d] - cum[row_lo[0], d]
+            bin_subbgl = cum[row_hi[1], d] - cum[row_lo[1], d]
+            bin_addbgt = cum[row_hi[2], d] - cum[row_lo[2], d]
+            bin_subbgt = cum[row_hi[3], d] - cum[row_lo[3], d]
+            bin_addsw = cum[row_hi[4], d] - cum[row_lo[4], d]
+            bin_subsw = cum[row_hi[5], d] - cum[row_lo[5], d]
+            # a**2 - s**2 = (a - s) * (a + s), the difference is shared with the update to hit_sum
+            diff_bgl = bin_addbgl - bin_subbgl
+            diff_bgt = bin_addbgt - bin_subbgt
+            rate[a, d] += bin_addsw - bin_subsw
+            hit_sum[a, d] += diff_bgl + diff_bgt
+            hit_sum2[a, d] += diff_bgl * (bin_addbgl + bin_subbgl) + diff_bgt * (bin_addbgt + bin_subbgt)
+
+
+# Analyses are spread over threads by prange, each thread sweeping all DOMs of its analysis serially
+#   The analysis axis is the one parallelized even though it is short, as the per-DOM work is too small to amortize
+#   thread dispatch and would need a cross-thread reduction of the three sums
+@njit(['void(int64[:, ::1], int64[:, ::1], int64[:, ::1], float64[::1], boolean[:, ::1], float32[::1], int64[::1], '
+       'float64[::1], float64[::1], float64[::1], float64[::1])',
+       'void(int64[:, ::1], int64[:, ::1], int64[:, ::1], float64[::1], boolean[:, ::1], float64[::1], int64[::1], '
+       'float64[::1], float64[::1], float64[::1], float64[::1])'],
+      parallel=True, nogil=True, cache=True, error_model='numpy', fastmath={'reassoc', 'contract', 'arcp'})
+def _update_results_kernel(hit_sum, hit_sum2, rate, nbin_bg, dom_status, eps, idx_ana, dmu, var_dmu, xi, chi2):
+    """Compute SICO results of a set of analyses from their sums, in a single pass over DOMs per analysis
+
+    Floating point reductions may be reordered and vectorized (fastmath reassoc/contract/arcp), but NaN and inf
+    are still propagated, as results are legitimately NaN/inf before an analysis has any valid DOMs.
+
+    Parameters
+    ----------
+    hit_sum, hit_sum2, rate : numpy.ndarray
+        (n_analyses, ndom) analysis sums
+    nbin_bg : numpy.ndarray
+        (n_analyses,) number of background bins of each analysis
+    dom_status : numpy.ndarray
+        (n_analyses, ndom) DOMs contributing to each analysis
+    eps : numpy.ndarray
+        (ndom,) relative DOM efficiency
+    idx_ana : numpy.ndarray
+        Indices of the analyses to update
+    dmu, var_dmu, xi, chi2 : numpy.ndarray
+        (n_analyses,) analysis results, updated in-place for analyses in idx_ana
+    """
+    ndom = hit_sum.shape[1]
+    for i in prange(idx_ana.size):
+        a = idx_ana[i]
+        # Invariant over DOMs, multiplying by reciprocals replaces two of the divisions per DOM
+        nbin = nbin_bg[a]
+        inv_nbin = 1. / nbin
+        inv_nbin2 = inv_nbin * inv_nbin
+        sum_rate_dev = 0.
+        sum_inv_var = 0.
+        sum_chi2 = 0.
+        for d in range(ndom):
+            if not dom_status[a, d]:
+                continue
+            mean = hit_sum[a, d] * inv_nbin
+            var = ((nbin * hit_sum2[a, d]) - (hit_sum[a, d] * hit_sum[a, d])) * inv_nbin2
+            _eps = np.float64(eps[d])
+            signal = rate[a, d] - mean
+            if var > 0:
+                # Both reductions share one division
+                eps_inv_var = _eps / var
+                sum_rate_dev += signal * eps_inv_var
+                sum_inv_var += _eps * eps_inv_var
+            # chi2 term, (signal*(1. - eps))**2 / (var + eps*abs(signal)), rate - (mean + eps*signal) simplified
+            num = signal * (1. - _eps)
+            denom = var + _eps * abs(signal)
+            if denom > 0:
+                sum_chi2 += num * num / denom
+        dmu[a] = sum_rate_dev / sum_inv_var
+        var_dmu[a] = 1. / sum_inv_var
+        xi[a] = dmu[a] / np.sqrt(var_dmu[a])
+        chi2[a] = sum_chi2
+
+
 _ana_conf_repr_string = """Analysis Configuration
 ======================
 | 
@@ -94,8 +215,8 @@ class AnalysisConfig:
         self.max_bkg_fano = max_bkg_fano
         self.max_bkg_abs_skew = max_bkg_abs_skew
 
-        self._base_binsize = np.min(self.binsize_ms)
-        self.max_binsize = np.max(self.binsize_ms)  # TODO: Change into property
+        self._base_binsize = int(min(self.binsize_ms))
+        self.max_binsize = int(max(self.binsize_ms))  # TODO: Change into property
 
     def __repr__(self):
         kwargs = vars(self)
@@ -249,24 +370,28 @@ class AnalysisHandler:
     -------
     accumulate:
         Accumulate 2 ms data into analysis bin size
-    check_for_triggers:
-        Check if any analysis meets the basic trigger condition.
-    istriggerable:
-        Indicates analysis is ready to trigger
     print_analyses:
         Print binsize and relative offset of all analysis objects
+    process_triggers:
+        Check if any analysis meets the trigger condition, and form candidates from those that do
     reset_accumulator:
         Reset accumulator count to rebin_factor and accum_data to zeros
     update:
-        Update raw buffer, analysis buffer, analyses sums and analysis results
+        Update accumulator, analysis buffer, analyses sums and analysis results
+    update_block:
+        Update analysis buffer, analyses sums and analysis results from a block of consecutive 2 ms data
     update_analyses:
         Update SICO sums and computed quantities for all analyses
     update_results:
         Update SICO analysis results
     update_sums:
         Update SICO analysis sums
+    validate_analysis:
+        Exclude DOMs failing background rate and Fano factor bounds from analyses
 
     """
+    # Default relative DOM efficiencies (HQE DOMs at 1.35), shared read-only by all handlers. See _default_eps
+    _DEFAULT_EPS = None
 
     def __init__(self, config, ndom=5160, eps=None, dtype=np.uint16,
                  start_time=np.datetime64('now'), dropped_doms=None):
@@ -278,8 +403,8 @@ class AnalysisHandler:
             Instance of Analysis configuration object
         ndom : int
             number of contributing DOMs
-        eps : numpy.ndarray
-            relative efficiency of contributing DOMs
+        eps : array_like or None
+            relative efficiency of contributing DOMs. If None, a shared, read-only default is used
         dtype
             Data type for SN scaler arrays
         start_time : np.datetime64
@@ -293,10 +418,8 @@ class AnalysisHandler:
         # Create shared window buffer
         self._binnings = config.binsize_ms
         self._ndom = ndom
-        if eps is None:
-            self._eps = np.where(np.arange(5160) > 4800, np.ones(5160), 1.35 * np.ones(5160))
-        else:
-            self._eps = eps
+        # Any numeric eps is converted once here to a contiguous float array, the layout the results kernel requires
+        self._eps = self._default_eps() if eps is None else np.ascontiguousarray(eps, dtype=np.float64)
         self._dtype = dtype
         self._start_time = start_time
         self._start_utime = datetime64_to_utime(start_time)
@@ -311,24 +434,63 @@ class AnalysisHandler:
         #   Max analysis offset (max(binnings) - base_binsize)
         #   Rates to subtract from buffer during analysis (max(binnings))
         self._size = ((config.duration_nosearch + 3 * self.config.max_binsize) // config.base_binsize) - 1
-        self._rebin_factor = int(config.base_binsize / config.raw_binsize)
-        self.buffer_raw = windowbuffer(size=self._size * self._rebin_factor, ndom=ndom, dtype=dtype)
-        self.buffer_analysis = windowbuffer(size=self._size, ndom=self._ndom, dtype=np.uint64)
-        self.buffer_xi = windowbuffer(size=config.dur_signi_buffer, ndom=len(self.config.binsize_ms), dtype=np.float64)
+        self._rebin_factor = config.base_binsize // config.raw_binsize
+        # uint32 holds one accumulator worth (base_binsize / raw_binsize) of uint16 scalers
+        # The buffer also keeps an int64 running sum, from which update_sums takes any rebinned bin as one difference
+        self.buffer_analysis = ringbuffer(size=self._size, ndom=self._ndom, dtype=np.uint32, cumulative=True)
+        # One row of xi per base analysis bin, for each binsize
+        self.buffer_xi = ringbuffer(size=config.dur_signi_buffer // config.base_binsize,
+                                    ndom=len(self.config.binsize_ms), dtype=np.float64)
+
+        # Analysis windows, (binsize, offset, starting buffer index) of each analysis
+        windows = []
+        idx_binning = []
+        for i, binning in enumerate(map(int, self._binnings)):
+            for offset in range(0, binning, 500):  # TODO: Increment by binsize not 500
+                # Integer form of int(size - (duration_nosearch + offset + binning) / base_binsize), no float round trip
+                idx = ((self._size * config.base_binsize - (config.duration_nosearch + offset + binning))
+                       // config.base_binsize)
+                windows.append((binning, offset, idx))
+                idx_binning.append(i)
+        # Column of buffer_xi to which each analysis reports, and the latest xi of each binsize
+        self._idx_binning = np.array(idx_binning, dtype=np.int64)
+        self._xi_latest = np.zeros(len(self._binnings))
+
+        # Analysis sums are stored as (n_analyses, ndom) arrays, each Analysis holds views of its own row
+        n_ana = len(windows)
+        self._hit_sum = np.zeros((n_ana, self._ndom), dtype=np.int64)
+        self._hit_sum2 = np.zeros((n_ana, self._ndom), dtype=np.int64)
+        self._rate = np.zeros((n_ana, self._ndom), dtype=np.int64)
+        self._dom_status = np.ones((n_ana, self._ndom), dtype=bool)
+        # Analysis results (dmu, var_dmu, xi, chi2), computed for all analyses at once
+        #   Each Analysis reads its own column, so results need not be copied back after every update
+        self._results = np.zeros((4, n_ana))
+        self._dmu, self._var_dmu, self._xi, self._chi2 = self._results
 
         # Create analyses
-        self.analyses = []
-        for binning in np.asarray(self._binnings, dtype=dtype):
-            for offset in np.arange(0, binning, 500, dtype=dtype):  # TODO: Increment by binsize not 500
-                idx = int(self._size - (config.duration_nosearch + offset + binning) / config.base_binsize)
-                self.analyses.append(
-                    Analysis(config, binning, offset, idx=idx, ndom=self._ndom, start_time=self._start_time)
-                )
-        Analysis.base_binsize_ms = self.config.base_binsize
+        self.analyses = [
+            Analysis(config, binning, offset, idx=idx, ndom=self._ndom, start_time=self._start_time,
+                     sums=(self._hit_sum[i], self._hit_sum2[i], self._rate[i]), dom_status=self._dom_status[i],
+                     results=self._results[:, i])
+            for i, (binning, offset, idx) in enumerate(windows)
+        ]
+        self._nbin_bg = np.array([analysis.nbin_bg for analysis in self.analyses], dtype=np.float64)
+        self._inv_nbin_bg = 1. / self._nbin_bg
+        # Scratch space for validation, gathered sums (hit_sum, hit_sum2) and derived quantities (mean, var, fano)
+        self._val_sums = np.empty((2, n_ana, self._ndom), dtype=np.int64)
+        self._val_quantities = np.empty((3, n_ana, self._ndom), dtype=np.float64)
+
+        # Buffer index following the bin to add to/subtract from the sums of all analyses, stacked so every analysis is
+        #   updated by a single kernel call. Shape is (region, analysis) with regions ordered as in _sum_regions
+        self._n_rebin = np.array([analysis.rebin_factor for analysis in self.analyses], dtype=np.int64)
+        self._idx_edges = np.zeros((len(_sum_regions), n_ana), dtype=np.int64)
+        for i, analysis in enumerate(self.analyses):
+            self._idx_edges[:, i] = analysis.idx_bins[:, -1] + 1
 
         # Define counter for accumulation used in rebinning from raw to base analysis
+        # uint32 running sum, rebin_factor 2 ms bins of `dtype` hits cannot overflow it
         self._accum_count = self._rebin_factor
-        self._accum_data = np.zeros(ndom, dtype=dtype)
+        self._accum_data = np.zeros(ndom, dtype=np.uint32)
 
         self.candidates = []
         self.trigger_count = 0
@@ -339,6 +501,26 @@ class AnalysisHandler:
         self._n_trigger_close = int(self.config.trigger_condition.dt_to_close / config.base_binsize)
         logger.debug('Analysis Handler Initialized.')
 
+    @classmethod
+    def _default_eps(cls):
+        """Default relative DOM efficiency, created on first use
+
+        Returns
+        -------
+        eps : numpy.ndarray
+            Read-only 5160-length float32 array, shared between all AnalysisHandler instances
+
+        Notes
+        -----
+        The array is flagged read-only so that an in-place write through one handler cannot silently change the
+        efficiencies seen by every other handler. Handlers with dropped DOMs receive a (writable) copy via np.delete.
+        """
+        if cls._DEFAULT_EPS is None:
+            eps = np.where(np.arange(5160) > 4800, np.float32(1.), np.float32(1.35))
+            eps.setflags(write=False)
+            cls._DEFAULT_EPS = eps
+        return cls._DEFAULT_EPS
+
     def set_start_time(self, start_time):
         """Sets time where the leading edge of the raw buffer sits
 
@@ -349,11 +531,8 @@ class AnalysisHandler:
         """
         self._start_time = start_time
         self._start_utime = datetime64_to_utime(start_time)
-        year = start_time.astype('datetime64[Y]').item().year
         for ana in self.analyses:
-            ana.start_time = start_time
-            ana.year = year
-            ana.utime_sw = datetime64_to_utime(start_time) - ((ana.idx_eod - ana.idx_sw) * int(ana._base_binsize * 1e7))
+            ana.set_start_time(start_time)
 
     def status(self):
         """Obtain a status string
@@ -404,7 +583,7 @@ class AnalysisHandler:
         # Performs rebinning automatically - ana.binsize is integer multiple of analysishandler.config.base_binsize
         # Reshapes are requires for np.add.at signature - 2nd arg, index needs shape ((n, 1), (1, m)) for (m, n) target
         np.add.at(lightcurve, (idx.reshape(-1, 1), np.arange(self.ndom).reshape(1, -1)),
-                  self.buffer_analysis[ana.idx_sw - nbins_rawl:ana.idx_sw + nbins_rawt, :])
+                  self.buffer_analysis.windows(np.arange(ana.idx_sw - nbins_rawl, ana.idx_sw + nbins_rawt)))
 
         return lightcurve
 
@@ -508,90 +687,72 @@ class AnalysisHandler:
     def update_analyses(self):
         """Update SICO sums and computed quantities for all analyses
         """
-        for analysis in self.analyses:
-            analysis.utime_sw += int(self.config.base_binsize * 1e7)
-            self.update_sums(analysis)
-
-            if analysis.is_updatable:
-                if analysis.is_online:
-                    # Perform validation before computing analysis quantities
-                    self.validate_analysis(analysis)
-                    self.update_results(analysis)
+        # Analysis state is advanced, and the analyses to update are selected, in a single pass
+        idx_update = []
+        idx_online = []
+        utime_step = int(self.config.base_binsize * 1e7)
+        # The counters and thresholds are plain int attributes, compared directly rather than through the
+        #   is_online/is_updatable properties, as this loop runs over every analysis on every base bin
+        for i, analysis in enumerate(self.analyses):
+            analysis.utime_sw += utime_step
+            analysis.n_accum += 1
+            if analysis.n < analysis.n_to_trigger:
+                analysis.n += 1  # Update until analysis.is_online returns true
+            if analysis.n_accum == analysis._rebin_factor:
+                idx_update.append(i)
+                if analysis.n >= analysis.n_to_trigger:
+                    idx_online.append(i)
                 analysis.reset_accum()  # Reset "updatable" counter TODO: Rename this to be more consistent
 
-    def update_sums(self, analysis):  # Assumes call after value has been appended to buffer
-        """Update SICO analysis sums after new data has been added to the buffer
+        if idx_update:
+            self.update_sums(np.array(idx_update, dtype=np.int64))
+
+        if idx_online:
+            idx_online = np.array(idx_online, dtype=np.int64)
+            # Perform validation before computing analysis quantities
+            self.validate_analysis(idx_online)
+            self.update_results(idx_online)
+            # Analyses of the same binsize are offset from one another, xi of the most recently updated is buffered
+            self._xi_latest[self._idx_binning[idx_online]] = self._xi[idx_online]
+        self.buffer_xi.append(self._xi_latest)
+
+    def update_sums(self, idx_ana):  # Assumes call after value has been appended to buffer
+        """Update SICO analysis sums of updatable analyses after new data has been added to the buffer
 
         Parameters
         ----------
-        analysis : sndaq.analysis.Analysis
-            Analysis object for which to update sums
+        idx_ana : numpy.ndarray of int
+            Indices in `analyses` of the Analysis objects for which a new rebinned bin is ready
         """
         # IMPORTANT!! ASSUMES VALUES ARE APPENDED TO BUFFER **BEFORE** `update_sums` IS CALLED!!
-        analysis.n_accum += 1
-        if not analysis.is_online:
-            analysis.n += 1  # Update until analysis.is_online returns true
-
-        if analysis.is_updatable:
-            # TODO: Find better names for these
-            add_to_bgl = self.buffer_analysis[analysis.idx_addbgl].sum(axis=0)
-            sub_from_bgl = self.buffer_analysis[analysis.idx_subbgl].sum(axis=0)
-
-            add_to_bgt = self.buffer_analysis[analysis.idx_addbgt].sum(axis=0)
-            sub_from_bgt = self.buffer_analysis[analysis.idx_subbgt].sum(axis=0)
+        # Index the ring storage of the running sum directly, physical row = (head - size + logical row) & mask
+        cum = self.buffer_analysis._buf_cum
+        mask = self.buffer_analysis._mask
+        base = self.buffer_analysis._buf_head - self._size
 
-            add_to_sw = self.buffer_analysis[analysis.idx_addsw].sum(axis=0)
-            sub_from_sw = self.buffer_analysis[analysis.idx_subsw].sum(axis=0)
+        _update_sums_kernel(cum, base, mask, idx_ana, self._idx_edges, self._n_rebin,
+                            self._hit_sum, self._hit_sum2, self._rate)
 
-            analysis.rate += add_to_sw
-            analysis.rate -= sub_from_sw
-
-            analysis.hit_sum += add_to_bgl + add_to_bgt
-            analysis.hit_sum -= (sub_from_bgl + sub_from_bgt)
-
-            analysis.hit_sum2 += (add_to_bgl ** 2 + add_to_bgt ** 2)
-            analysis.hit_sum2 -= (sub_from_bgl ** 2 + sub_from_bgt ** 2)
-
-    def update_results(self, analysis):
+    def update_results(self, idx_ana):
         """Update SICO analysis results
 
         Parameters
         ----------
-        analysis : sndaq.analysis.Analysis
-            Analysis object for which to update quantities computed from sums
+        idx_ana : numpy.ndarray of int
+            Indices in `analyses` of the Analysis objects for which to update quantities computed from sums
         """
         # Analysis results are updated by the handler as the analysis class (currently) is intended to be a container
         #   The handler is intended to contain the algorithms
-        idx = analysis.dom_status
-        mean = analysis.mean[idx]
-        var = analysis.var[idx]
-        rate = analysis.rate[idx]
-        eps = self.eps[idx]
-        signal = rate - mean
-
-        sum_rate_dev = np.divide(signal * eps, var, out=np.zeros_like(signal), where=var > 0).sum()
-        sum_inv_var = np.divide(eps**2,  var, out=np.zeros_like(eps), where=var > 0).sum()
-        analysis.dmu = sum_rate_dev / sum_inv_var
-        analysis.var_dmu = 1. / sum_inv_var
-
-        # calc xi
-        analysis.xi = analysis.dmu / np.sqrt(analysis.var_dmu)
-
-        # calc chi2
-        # tmp = (signal*(1. - eps))**2 / (var + eps*abs(signal))
-        _num = (rate - (mean + eps * signal)) ** 2
-        _denom = (var + eps * abs(signal))
-        analysis.chi2 = np.divide(_num, _denom, out=np.zeros_like(_num), where=_denom > 0).sum()
-
-    def accumulate(self, val, idx):
+        _update_results_kernel(self._hit_sum, self._hit_sum2, self._rate, self._nbin_bg, self._dom_status, self.eps,
+                               idx_ana, self._dmu, self._var_dmu, self._xi, self._chi2)
+
+    def accumulate(self, val):
         """Accumulate 2 ms data into analysis binsize
 
         Parameters
         ----------
         val : numpy.ndarray of int
             ndom-length array of 2 ms scaler hits to be accumulated into higher order binnings.
-        idx : numpy.ndarray of int
-            Indices of DOMs at which to add 2 ms scaler hits
 
         Returns
         -------
@@ -609,7 +770,8 @@ class AnalysisHandler:
         sndaq.analysis.reset_accumulator
         """
         # This could be it's own class/component, maybe use itertools? Maybe use a generator w/ yield?
-        np.add.at(self._accum_data, idx, val)
+        # A dense in-place add over all DOMs is cheaper than gathering the non-zero DOMs and scattering with np.add.at
+        np.add(self._accum_data, val, out=self._accum_data)
         self._accum_count -= 1
         return bool(self._accum_count)
 
@@ -624,24 +786,20 @@ class AnalysisHandler:
         --------
         sndaq.analysis.accumulate
         """
-        self._accum_data = np.zeros(self._ndom, dtype=self._dtype)
-        # _ndom and _dtype could be removed if this was part of an accumulator object, defined during init.
+        self._accum_data.fill(0)
         self._accum_count = self._rebin_factor
 
-    def _validate_bounded_quantity(self, ana, quantity, q_min, q_max, name=None):
+    def _validate_bounded_quantity(self, dom_status, quantity, q_min, q_max, name=None):
         """ Perform validation on analysis quantity based on config-specified bounds.
         DOMs failing validation (quantities outside bounds) are excluded from analysis sums
         Default Quantites are bkg Hit rate: mean, variance, & fano
 
-        TODO: Would making this a member of the analysis class be better for performance, so as to prevent multiple
-            instances of the same analysis object?
-
         Parameters
         ----------
-        ana : sndaq.analysis.Analysis
-            Analysis currently begin validated
+        dom_status : np.ndarray[bool]
+            (n_analyses, ndom) status of DOMs in the analyses currently being validated
         quantity : np.ndarray[float]
-            Analysis quantity on which to perform validation
+            (n_analyses, ndom) Analysis quantity on which to perform validation
         q_min : float
             Lower bound of `quantity`
         q_max : float
@@ -663,75 +821,141 @@ class AnalysisHandler:
         # Condition indicates that quant falls within bounds (True = "Good")
         cond = (q_min < quantity) & (quantity < q_max)
 
-        # Detect changes, if no changes take no action
-        if not np.all(cond == ana.dom_status):
-            # Find good doms that have failed validation, and exclude them from analysis
-            #   (dom_status == True [Good DOM] and cond_bkg == False [DOM failed validation])
-            mask_bad = ana.dom_status & ~cond
+        # Find good doms that have failed validation, and exclude them from analysis
+        #   (dom_status == True [Good DOM] and cond_bkg == False [DOM failed validation])
+        mask_bad = dom_status & ~cond
 
-            # Find bad doms that have passed validation, and include them analysis
-            #   (dom_status == False [Bad DOM] and cond_bkg == True [DOM passed validation])
-            mask_good = ~ana.dom_status & cond
+        # Find bad doms that have passed validation, and include them analysis
+        #   (dom_status == False [Bad DOM] and cond_bkg == True [DOM passed validation])
+        mask_good = ~dom_status & cond
 
-            return mask_good, mask_bad
-        else:
-            # True in this case indicates tha this DOM's status should be change, by default make no changes
-            return np.zeros_like(cond), np.zeros_like(cond)
+        return mask_good, mask_bad
 
-    def validate_analysis(self, analysis):
-        """Performs validation on an SNDAQ Analysis. Checks are performed DOM-by-DOM and
+    def validate_analysis(self, idx_ana):
+        """Performs validation on SNDAQ Analyses. Checks are performed DOM-by-DOM and
         offending DOMs' contributions are removed from analysis quantities.
-        """
-        # Validation only occurs on analyses that are ready to report results (is_online)
-        #    and are ready to be updated (is_updatable), meaning a new sum can be computed
-        if analysis.is_online and analysis.is_updatable:
 
+        Parameters
+        ----------
+        idx_ana : numpy.ndarray of int
+            Indices in `analyses` of the Analysis objects to validate
+
+        Notes
+        -----
+        Validation only occurs on analyses that are ready to report results (is_online) and are ready to be updated
+        (is_updatable), meaning a new sum can be computed. It is up to the caller to only pass such analyses.
+        """
+        for i in idx_ana:
+            analysis = self.analyses[i]
             # Analysis has enough contributing DOMs [bool]
             cond_ndom = analysis.ndom > self.config.min_active_doms
-            if (analysis.is_valid and not cond_ndom) or (~analysis.is_valid and cond_ndom):
-                analysis.is_valid = ~analysis.is_valid
+            if analysis.is_valid != cond_ndom:
+                analysis.is_valid = cond_ndom
                 logger.debug(f"Analysis #{analysis.n_ana} nDOM check changed state!  is_valid: {analysis.is_valid}")
 
-            # DOM-wise checks
-            mask_good_mean, mask_bad_mean = self._validate_bounded_quantity(analysis, analysis.mean,
-                                                                           self.config.min_bkg_rate,
-                                                                           self.config.max_bkg_rate)
-            mask_good_fano, mask_bad_fano = self._validate_bounded_quantity(analysis, analysis.fano,
-                                                                           self.config.min_bkg_fano,
-                                                                           self.config.max_bkg_fano)
-            mask_good = mask_good_mean & mask_good_fano
-            mask_bad = mask_bad_mean & mask_bad_fano
-
-            if np.any(mask_bad):
-                logger.debug(f"Analysis #{analysis.n_ana}: {mask_bad.sum()} DOMs removed after failing validation")
-            if np.any(mask_good):
-                logger.debug(f"Analysis #{analysis.n_ana}: {mask_good.sum()} DOMs added after passing validation")
-            # TODO: Add Jitter & Noise Validation
-            # TODO: Add monitoring quantity for number of state changes
-            # TODO: Check if analysis sums present rates in Hz or counts (/binsize)
+        # DOM-wise checks, performed for all analyses at once on rows of the (n_analyses, ndom) sums
+        # Quantities are written into preallocated scratch, so no (n_analyses, ndom) temporaries are allocated per tick
+        # Normalization is by multiplication with the per-analysis reciprocal of nbin, rather than division per DOM
+        n = idx_ana.size
+        nbin = self._nbin_bg[idx_ana, np.newaxis]
+        inv_nbin = self._inv_nbin_bg[idx_ana, np.newaxis]
+        hit_sum = np.take(self._hit_sum, idx_ana, axis=0, out=self._val_sums[0, :n])
+        hit_sum2 = np.take(self._hit_sum2, idx_ana, axis=0, out=self._val_sums[1, :n])
+        mean, var, fano = self._val_quantities[:, :n]
+        np.multiply(hit_sum, inv_nbin, out=mean)
+        # var = ((nbin * hit_sum2) - (hit_sum * hit_sum)) / (nbin * nbin), hit_sum2 is overwritten by hit_sum**2
+        np.multiply(nbin, hit_sum2, out=var)
+        var -= np.multiply(hit_sum, hit_sum, out=hit_sum2)
+        var *= inv_nbin * inv_nbin
+        fano.fill(0.)
+        np.divide(var, mean, out=fano, where=mean != 0)
+        dom_status = self._dom_status[idx_ana]
+
+        mask_good_mean, mask_bad_mean = self._validate_bounded_quantity(dom_status, mean,
+                                                                       self.config.min_bkg_rate,
+                                                                       self.config.max_bkg_rate)
+        mask_good_fano, mask_bad_fano = self._validate_bounded_quantity(dom_status, fano,
+                                                                       self.config.min_bkg_fano,
+                                                                       self.config.max_bkg_fano)
+        n_good = (mask_good_mean & mask_good_fano).sum(axis=1)
+        n_bad = (mask_bad_mean & mask_bad_fano).sum(axis=1)
+
+        for i, n_good_ana, n_bad_ana in zip(idx_ana, n_good, n_bad):
+            if n_bad_ana:
+                logger.debug(f"Analysis #{self.analyses[i].n_ana}: {n_bad_ana} DOMs removed after failing validation")
+            if n_good_ana:
+                logger.debug(f"Analysis #{self.analyses[i].n_ana}: {n_good_ana} DOMs added after passing validation")
+        # TODO: Add Jitter & Noise Validation
+        # TODO: Add monitoring quantity for number of state changes
+        # TODO: Check if analysis sums present rates in Hz or counts (/binsize)
 
     def update(self, value):
         # TODO: Figure out how to enable streaming only analysis-binning data
-        """Update raw buffer, analysis buffer, analyses sums and analysis results
+        """Update accumulator, analysis buffer, analyses sums and analysis results
 
         Parameters
         ----------
         value : numpy.ndarray
             2ms data for each DOM at a particular timestamp
         """
-        self.buffer_raw.append(value)
-        idx = value.nonzero()[0]  # Returns tuple, the first element of which is indices of non-zero elem
-        if not self.accumulate(value[idx], idx):
+        if not self.accumulate(value):
             # Accumulator indicates time to reset, as base analysis bin of data is ready
             # TODO: Find a more intuitive way of doing this.
-            accumulated_data = np.asarray(self._accum_data, dtype=np.uint16)
+            # The buffer copies the accumulator into its own storage, so the accumulator may then be reset in-place
+            self._update_base_bin(self._accum_data)
             self.reset_accumulator()
-            self.buffer_analysis.append(accumulated_data)
-            self.update_analyses()
-            # Get triggerable analyses [ana for ana in self.analyses if ana.is_online and ana.is_triggerable]
-            # For only those analyses, evaluate if a trigger threshold has been met
-            # For FRA, could also check if analysis search window also overlaps with trigger time
-            self.process_triggers()
+
+    def update_block(self, values):
+        """Update accumulator, analysis buffer, analyses sums and analysis results from a block of 2 ms data
+
+        Parameters
+        ----------
+        values : numpy.ndarray
+            (n, ndom) 2ms data for each DOM, one row per consecutive timestamp
+
+        Notes
+        -----
+        Equivalent to calling `update` on each row in turn, but every complete base bin in the block is rebinned with a
+        single reduction rather than being accumulated one 2 ms row at a time. Rows that do not complete a base bin are
+        left in the accumulator, to be completed by the next call to `update` or `update_block`.
+        Candidates from all base bins completed by the block are collected before returning, so the caller should check
+        `trigger_finalized` once per call.
+        """
+        rf = self._rebin_factor
+        n = values.shape[0]
+        i = 0
+        while i < n:
+            if self._accum_count == rf and n - i >= rf:
+                # Accumulator is empty, rebin all complete base bins remaining in the block at once
+                nbin = (n - i) // rf
+                bins = values[i:i + nbin*rf].reshape(nbin, rf, -1).sum(axis=1, dtype=np.uint32)
+                for base_bin in bins:
+                    self._update_base_bin(base_bin)
+                i += nbin*rf
+            else:
+                # Top up the partially filled accumulator, or start it with the tail of the block
+                k = min(self._accum_count, n - i)
+                self._accum_data += values[i:i + k].sum(axis=0, dtype=np.uint32)
+                self._accum_count -= k
+                i += k
+                if not self._accum_count:
+                    self._update_base_bin(self._accum_data)
+                    self.reset_accumulator()
+
+    def _update_base_bin(self, base_bin):
+        """Append a base analysis bin of data to the analysis buffer, then update analyses and check for triggers
+
+        Parameters
+        ----------
+        base_bin : numpy.ndarray
+            ndom-length array of scaler hits summed over one base analysis bin
+        """
+        self.buffer_analysis.append(base_bin)
+        self.update_analyses()
+        # Get triggerable analyses [ana for ana in self.analyses if ana.is_online and ana.is_triggerable]
+        # For only those analyses, evaluate if a trigger threshold has been met
+        # For FRA, could also check if analysis search window also overlaps with trigger time
+        self.process_triggers()
 
     def process_triggers(self):
         """Check if any analysis meets the primary trigger threshold.
@@ -747,21 +971,29 @@ class AnalysisHandler:
         if potential_analyses:
             # Detect Escalating trigger
             if self.config.trigger_condition is PrimaryTrigger:
-                xi = np.array([ana.xi for (_, ana) in potential_analyses])
-                xi_max = xi.max(initial=0.0)
-
-                if xi_max > self.candidates[0].xi:
+                # Significances of all analyses are held in one array by update_results, gather instead of rebuilding
+                xi = self._xi[[i for (i, _) in potential_analyses]]
+                # One pass gives both the highest significance and its position, xi is non-empty here
+                idx_max = xi.argmax()
+                xi_max = xi[idx_max]
+
+                # The first trigger of a candidate has no previous trigger to escalate from
+                if not self.candidates or xi_max > self.candidates[0].xi:
                     self.trigger_count += 1
                     # Extend trigger window after new highest trigger
                     self.open_trigger_window()
 
                     # This is a little obtuse, but idx here refers to the index of ana in self.analyses
-                    idx = potential_analyses[xi.argmax()][0]
+                    idx = potential_analyses[idx_max][0]
                     ana = self.analyses[idx]
 
                     # Corrected signi is set upon candidate becoming finalized, performed by trigger handler
                     # TODO: Set this up with from_analysis method
-                    self.candidates[0] = Trigger.from_analysis(ana, self.trigger_count, self.cand_count + 1)
+                    trigger = Trigger.from_analysis(ana, self.trigger_count, self.cand_count + 1)
+                    if self.candidates:
+                        self.candidates[0] = trigger
+                    else:
+                        self.candidates.append(trigger)
 
             if self.config.trigger_condition is FastResponseTrigger:
                 self.candidates += [Trigger.from_analysis(ana, 1, self.cand_count+1+idx)
@@ -784,14 +1016,15 @@ class AnalysisHandler:
         data : np.ndarray of float
             Buffered xi in the requested binsize
         """
-        idx_bin = self.config.binsize_ms.argsort(binsize)[0][0]
+        idx_bin = np.flatnonzero(self._binnings == binsize)[0]
 
         # Guard against 0-padding at start of run
-        if self.buffer_xi.n < (self.config.dur_signi_buffer // self.config.base_binsize):
+        n_xi = self.config.dur_signi_buffer // self.config.base_binsize
+        if self.buffer_xi.n < n_xi:
             # Do not return non-populated entries in buffer
-            return self.buffer_xi.data[-self.buffer_xi.n:, idx_bin]
+            return self.buffer_xi[n_xi - self.buffer_xi.n:, idx_bin]
         # TODO: Add check for end of run
-        return self.buffer_xi.data[:, idx_bin]
+        return self.buffer_xi[:, idx_bin]
 
     def get_buffered_rmu(self, binsize):
         """Return buffered muon rates in requested binsize
@@ -827,9 +1060,23 @@ class AnalysisHandler:
 class Analysis:
     """Descriptor object to handle data access and algorithms for SNDAQ sico-analysis
     """
-    base_binsize_ms = 500
-
-    def __init__(self, config, binsize, offset, idx=0, ndom=5160, start_time=0):
+    # Attributes are stored in fixed slots rather than a per-instance __dict__, as they are read for every analysis on
+    #   every base bin. Any new instance attribute must be added here
+    __slots__ = (
+        # Configuration and bookkeeping
+        '_binsize', '_base_binsize', '_offset', '_rebin_factor', '_ndom', '_dom_status', 'n_ana', 'is_valid',
+        '_nbin_nosearch', '_nbin_background',
+        # Analysis buffer indices
+        'idx_bgt', 'idx_ext', 'idx_sw', 'idx_exl', 'idx_bgl', 'idx_eod', '_n_eod_sw', 'idx_bins',
+        'idx_addbgl', 'idx_subbgl', 'idx_addbgt', 'idx_subbgt', 'idx_addsw', 'idx_subsw',
+        # Sums and results
+        'hit_sum', 'hit_sum2', 'rate', 'n_accum', '_results',
+        # Trigger readiness and timing
+        'n_to_trigger', 'n', 'start_time', 'year', 'utime_sw',
+    )
+
+    def __init__(self, config, binsize, offset, idx=0, ndom=5160, start_time=0, *, sums=None, dom_status=None,
+                 results=None):
         """Create Analysis object
 
         Parameters
@@ -846,63 +1093,73 @@ class Analysis:
             Number of DOMs contributing to the analysis
         start_time : np.datetime64
             UTC time at the start of Analysis
+        sums : tuple of numpy.ndarray or None
+            Zeroed (hit_sum, hit_sum2, rate) int64 arrays of shape (ndom,) in which to keep the analysis sums, such as
+            rows of the arrays held by AnalysisHandler. If None, new arrays are allocated
+        dom_status : numpy.ndarray or None
+            bool array of shape (ndom,) in which to keep DOM status. If None, a new array of all True is allocated
+        results : numpy.ndarray or None
+            Zeroed float64 array of shape (4,) in which to keep results (dmu, var_dmu, xi, chi2). If None, a new
+            array is allocated
         """
         if (binsize % config.base_binsize) > 0:  # Binsize must be an integer multiple of base_binsize
-            raise RuntimeError(f'Binsize {binsize:d} ms is incompatible, must be factor of {config.base_binsize:d} ms')
+            raise RuntimeError(f'Binsize {binsize:d} ms is incompatible, must be a multiple of {config.base_binsize:d} ms')
         self._binsize = binsize  # ms
         self._base_binsize = config.base_binsize  # ms
         self._offset = offset  # ms
-        self._rebin_factor = int(self._binsize / config.base_binsize)
+        self._rebin_factor = self._binsize // config.base_binsize
         # TODO: Decide if ndom should always be 5160 or the number of doms in the current config
 
         # Bookkeeping quantities
         self._ndom = ndom
-        self._dom_status = np.ones(self._ndom, dtype=bool)
-        self.n_ana = int((self._binsize + self._offset)/self._base_binsize)
+        self._dom_status = np.ones(self._ndom, dtype=bool) if dom_status is None else dom_status
+        self.n_ana = (self._binsize + self._offset) // self._base_binsize
         self.is_valid = True
 
         self._nbin_nosearch = config.duration_nosearch / self._binsize
         self._nbin_background = (config.duration_bgl_ms + config.duration_bgt_ms) / self._binsize
 
         # Indices for accessing data buffer, all point to first column in respective region
+        # These are computed once from integer bin counts, as they never change for a given analysis
         # TODO: Check alignment so all start filling as soon as possible
-        self._idx_bgt = idx  # Trailing background
-        self._idx_ext = self._idx_bgt + int(config.duration_bgt_ms / self._base_binsize)  # Trailing exclusion
-        self._idx_sw = self._idx_ext + int(config.duration_ext_ms / self._base_binsize)  # Search window
-        self._idx_exl = self._idx_sw + int(self.binsize / self._base_binsize)  # Leading exclusion
-        self._idx_bgl = self._idx_exl + int(config.duration_exl_ms / self._base_binsize)  # Leading background
-        self.idx_eod = self._idx_bgl + int(config.duration_bgl_ms / self._base_binsize)  # End of data in analysis
+        base_binsize = int(config.base_binsize)
+        rebin_factor = self._rebin_factor
+        self.idx_bgt = idx  # Trailing background
+        self.idx_ext = self.idx_bgt + config.duration_bgt_ms // base_binsize  # Trailing exclusion
+        self.idx_sw = self.idx_ext + config.duration_ext_ms // base_binsize  # Search window
+        self.idx_exl = self.idx_sw + rebin_factor  # Leading exclusion
+        self.idx_bgl = self.idx_exl + config.duration_exl_ms // base_binsize  # Leading background
+        self.idx_eod = self.idx_bgl + config.duration_bgl_ms // base_binsize  # End of data in analysis
         self._n_eod_sw = self.idx_eod - self.idx_sw
 
         # Indices of Analysis buffer for "bins" to add to sums for analysis
-        # Using np.arange here (np arrays as indices) allows all analyses to be indexed in the same way
-        # It's important to compute this only once, as these indices will never change for a given analysis
-        self._idx_addbgl = np.arange(self.idx_eod - self.rebin_factor, self.idx_eod)  # Add to leading bg
-        self._idx_subbgl = np.arange(self.idx_bgl - self.rebin_factor, self.idx_bgl)  # Subtract from leading bg
-        self._idx_addbgt = np.arange(self.idx_ext - self.rebin_factor, self.idx_ext)  # Add to trailing bg
-        self._idx_subbgt = np.arange(self.idx_bgt - self.rebin_factor, self.idx_bgt)  # Subtract from trailing bg
-        self._idx_addsw = np.arange(self.idx_exl - self.rebin_factor, self.idx_exl)  # Add to search window
-        self._idx_subsw = np.arange(self.idx_sw - self.rebin_factor, self.idx_sw)  # Subtract from search window
+        # Stored as one (region, rebin_factor) array, regions ordered as in _sum_regions, so all bins of an analysis
+        #   may be gathered at once. Each region is the rebin_factor columns preceding the respective window edge
+        self.idx_bins = np.array([
+            self.idx_eod,  # Add to leading bg
+            self.idx_bgl,  # Subtract from leading bg
+            self.idx_ext,  # Add to trailing bg
+            self.idx_bgt,  # Subtract from trailing bg
+            self.idx_exl,  # Add to search window
+            self.idx_sw,  # Subtract from search window
+        ]).reshape(-1, 1) + np.arange(-rebin_factor, 0)
+        (self.idx_addbgl, self.idx_subbgl, self.idx_addbgt,
+         self.idx_subbgt, self.idx_addsw, self.idx_subsw) = self.idx_bins
 
         # Quantities used to construct trigger
-        self.hit_sum = np.zeros(self._ndom, dtype=np.uint64)
-        self.hit_sum2 = np.zeros(self._ndom, dtype=np.uint64)
-        self.rate = np.zeros(self._ndom, dtype=np.uint64)
+        if sums is None:
+            sums = tuple(np.zeros(self._ndom, dtype=np.int64) for _ in range(3))
+        self.hit_sum, self.hit_sum2, self.rate = sums
         self.n_accum = 0
 
-        # Quantities used to evaluate trigger
-        self.dmu = 0.
-        self.var_dmu = 0.
-        self.xi = 0.
-        self.chi2 = 0.
+        # Quantities used to evaluate trigger (dmu, var_dmu, xi, chi2)
+        self._results = np.zeros(4) if results is None else results
 
         # Quantities used to evaluate when analysis is ready to start forming sums and issuing triggers
         # Analysis becomes triggerable when trailing background has filled
-        self.n_to_trigger = self.idx_eod - self.idx_bgt + int(self.offset / config.base_binsize)
+        self.n_to_trigger = self.idx_eod - self.idx_bgt + offset // base_binsize
         self.n = 0
-        self.start_time = start_time
-        self.year = start_time.astype('datetime64[Y]').item().year
-        self.utime_sw = datetime64_to_utime(start_time) - ((self.idx_eod - self.idx_sw) * int(self._base_binsize * 1e7))
+        self.set_start_time(start_time)
         logger.debug(f"Analysis {self.binsize}+({self.offset}) Initialized")
 
     def __repr__(self):
@@ -940,6 +1197,18 @@ class Analysis:
         else:
             return np.datetime64("NaT")
 
+    def set_start_time(self, start_time):
+        """Sets time where the leading edge of the analysis buffer sits, and the corresponding search window time
+
+        Parameters
+        ----------
+        start_time : np.datetime64
+            UTC time at the start of Analysis
+        """
+        self.start_time = start_time
+        self.year = start_time.astype('datetime64[Y]').item().year
+        self.utime_sw = datetime64_to_utime(start_time) - (self._n_eod_sw * int(self._base_binsize * 1e7))
+
     def reset_accum(self):
         """Reset Analysis accumulator sums after collecting 500 ms of data
         """
@@ -1016,6 +1285,50 @@ class Analysis:
         """
         return self.n_accum == 0
 
+    @property
+    def dmu(self):
+        """Collective rate deviation
+
+        Returns
+        -------
+        dmu : float
+            Estimated deviation of the search window rate from background, common to all DOMs
+        """
+        return self._results[0]
+
+    @property
+    def var_dmu(self):
+        """Variance of collective rate deviation
+
+        Returns
+        -------
+        var_dmu : float
+            Variance of the estimated collective rate deviation
+        """
+        return self._results[1]
+
+    @property
+    def xi(self):
+        """Significance of collective rate deviation
+
+        Returns
+        -------
+        xi : float
+            Collective rate deviation in units of its standard deviation, dmu / sqrt(var_dmu)
+        """
+        return self._results[2]
+
+    @property
+    def chi2(self):
+        """Chi-squared of collective rate deviation
+
+        Returns
+        -------
+        chi2 : float
+            Chi-squared of the DOM rates with respect to the collective rate deviation
+        """
+        return self._results[3]
+
     @property
     def nbin_nosearch(self):
         """Number of background and exclusion bins
@@ -1071,7 +1384,7 @@ class Analysis:
             Variance of background hit rate per bin measured across both background windows
         """
         # TODO: Unit test for float type!
-        return ((self.nbin_bg * self.hit_sum2) - (self.hit_sum ** 2)) / self.nbin_bg ** 2
+        return ((self.nbin_bg * self.hit_sum2) - (self.hit_sum * self.hit_sum)) / (self.nbin_bg * self.nbin_bg)
 
     @property
     def fano(self):
@@ -1119,6 +1432,17 @@ class Analysis:
         """
         return self._offset
 
+    @property
+    def base_binsize_ms(self):
+        """Base analysis binsize in ms, the binsize of the analysis buffer
+
+        Returns
+        -------
+        base_binsize_ms : int
+            Base analysis binsize in ms
+        """
+        return self._base_binsize
+
     @property
     def rebin_factor(self):
         """Rebinning factor (Ratio of binsize to base_binsize)
@@ -1144,94 +1468,3 @@ class Analysis:
     @property
     def n_eod_sw(self):
         return self._n_eod_sw
-
-    @property
-    def idx_bgl(self):
-        """Leading background window index
-
-        Returns
-        -------
-        _idx_bgl : int
-            Index of first column in leading background window
-        """
-        return self._idx_bgl
-
-    @property
-    def idx_exl(self):
-        """Leading exclusion window index
-
-        Returns
-        -------
-        _idx_exl : int
-            Index of first column in leading exclusion window
-        """
-        return self._idx_exl
-
-    @property
-    def idx_sw(self):
-        """Search window index
-
-        Returns
-        -------
-        _idx_sw : int
-            Index of first column in search window
-        """
-        return self._idx_sw
-
-    @property
-    def idx_ext(self):
-        """Trailing exclusion window index
-
-        Returns
-        -------
-        _idx_ext : int
-            Index of first column in trailing exclusion window
-        """
-        return self._idx_ext
-
-    @property
-    def idx_bgt(self):
-        """Trailing background window index
-
-        Returns
-        -------
-        _idx_bgt
-        Index of first column in trailing background window
-        """
-        return self._idx_bgt
-
-    @property
-    def idx_addbgl(self):
-        """Indices to add to leading background during binned analysis
-        """
-        return self._idx_addbgl
-
-    @property
-    def idx_subbgl(self):
-        """Indices to subtract from leading background during binned analysis
-        """
-        return self._idx_subbgl
-
-    @property
-    def idx_addbgt(self):
-        """Indices to add to trailing background during binned analysis
-        """
-        return self._idx_addbgt
-
-    @property
-    def idx_subbgt(self):
-        """Indices to subtract from trailing background during binned analysis
-        """
-        return self._idx_subbgt
-
-    @property
-    def idx_addsw(self):
-        """Indices to add to search window during binned analysis
-        """
-        return self._idx_addsw
-
-    @property
-    def idx_subsw(self):
-        """Indices to subtract from search window during binned analysis
-        """
-        return self._idx_subsw
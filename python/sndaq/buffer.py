@@ -44,6 +44,9 @@ class sndaqbuffer(ABC):
 
 class windowbuffer(sndaqbuffer):
     """Rolling buffer used for SNDAQ SICO analysis
+
+    Data is stored row-major with shape (buflen, ndom), time along the first axis, so each row and any run of
+    consecutive rows are contiguous in memory and `data` and `__getitem__` return views rather than copies.
     """
     def __init__(self, size, ndom=5160, dtype=np.uint16, mult=2):
         super().__init__(size, ndom, dtype)
@@ -51,7 +54,7 @@ class windowbuffer(sndaqbuffer):
         self._buflen = self._size*self._mult
         self._n = 0
         self._data = np.zeros(shape=(self._buflen, self._ndom),
-                              dtype=self._dtype)
+                              dtype=self._dtype, order='C')
         self._idx = self._size
 
     def append(self, entry):
@@ -78,14 +81,33 @@ class windowbuffer(sndaqbuffer):
     def clear(self):
         """Clear data buffer
         """
-        self._data = np.zeros(shape=(self._buflen, self._ndom),
-                              dtype=self._dtype)
+        # Zero in-place, so views previously taken from this buffer remain valid and no allocation is needed
+        self._data.fill(0)
         self._idx = self._size
 
     def _reset(self):
         self._idx = self._size
         self._data[:self._size, :] = self._data[-self._size:, :]
 
+    def windows(self, idx):
+        """Gather buffer rows at logical indices in a single fancy-index
+
+        Parameters
+        ----------
+        idx : numpy.ndarray of int
+            Logical row indices in [0, size), of any shape
+
+        Returns
+        -------
+        rows : numpy.ndarray
+            Array of shape (*idx.shape, ndom) containing the requested rows
+
+        See Also
+        --------
+        ringbuffer.windows
+        """
+        return self._data[self._idx - self._size + idx]
+
     def __getitem__(self, key):
         return self.data[key]
 
@@ -138,12 +160,142 @@ class windowbuffer(sndaqbuffer):
         return self._n
 
 
+class ringbuffer(sndaqbuffer):
+    """Rolling buffer stored as a fixed ring of rows, used for SNDAQ SICO analysis
+
+    Rows are never shifted in memory, instead a head pointer tracks the next row to be written. The ring length is
+    rounded up to a power of two so that the physical row holding logical row `k` (0 = oldest, size-1 = newest) is
+    found with a single mask, ``(_buf_head - size + k) & _mask``.
+
+    If `cumulative` is set, a running (prefix) sum of all appended rows is kept alongside the data in `_buf_cum`, in
+    the same ring layout. Row ``rows(k)`` of `_buf_cum` holds the int64 sum of every row appended up to and including
+    logical row `k`, so the sum over any run of logical rows [j, k] is ``_buf_cum[rows(k)] - _buf_cum[rows(j - 1)]``,
+    whatever its length. One extra row is kept in the ring, so that j = 0 may be used.
+    """
+    def __init__(self, size, ndom=5160, dtype=np.uint16, cumulative=False):
+        super().__init__(size, ndom, dtype)
+        self._buflen = 1 << max(int(self._size) - 1 + bool(cumulative), 0).bit_length()
+        self._mask = self._buflen - 1
+        self._n = 0
+        self._buf_data = np.zeros(shape=(self._buflen, self._ndom),
+                                  dtype=self._dtype)
+        self._buf_cum = np.zeros(shape=(self._buflen, self._ndom), dtype=np.int64) if cumulative else None
+        self._buf_head = 0
+        # Logical row indices, kept so that indexing the buffer need not build them on each call
+        self._logical_rows = np.arange(self._size)
+
+    def append(self, entry):
+        """Add entry to front of array
+
+        Parameters
+        ----------
+        entry : numpy.ndarray
+            ndom-length array of new values to add to array
+
+        Returns
+        -------
+        self : ringbuffer
+            The current ringbuffer object
+        """
+        self._buf_data[self._buf_head, :] = entry
+        if self._buf_cum is not None:
+            np.add(self._buf_cum[(self._buf_head - 1) & self._mask], self._buf_data[self._buf_head],
+                   out=self._buf_cum[self._buf_head])
+        self._buf_head = (self._buf_head + 1) & self._mask
+        self._n += 1
+        return self
+
+    def clear(self):
+        """Clear data buffer
+        """
+        self._buf_data.fill(0)
+        if self._buf_cum is not None:
+            self._buf_cum.fill(0)
+        self._buf_head = 0
+        self._n = 0
+
+    def rows(self, idx):
+        """Physical rows of `_buf_data` corresponding to logical buffer indices
+
+        Parameters
+        ----------
+        idx : int or numpy.ndarray of int
+            Logical row indices in [0, size), 0 being the oldest row of the buffer
+
+        Returns
+        -------
+        rows : int or numpy.ndarray of int
+            Indices of the rows in `_buf_data` holding the requested data
+        """
+        return (self._buf_head - self._size + idx) & self._mask
+
+    def windows(self, idx):
+        """Gather buffer rows at logical indices in a single fancy-index
+
+        Parameters
+        ----------
+        idx : numpy.ndarray of int
+            Logical row indices in [0, size), of any shape
+
+        Returns
+        -------
+        rows : numpy.ndarray
+            Array of shape (*idx.shape, ndom) containing the requested rows
+        """
+        return self._buf_data[self.rows(idx)]
+
+    def __getitem__(self, key):
+        key_row, key_col = key if isinstance(key, tuple) else (key, slice(None))
+        return self.windows(self._logical_rows[key_row])[..., key_col]
+
+    @property
+    def data(self):
+        """Retrieve contents of rolling buffer
+
+        Returns
+        -------
+        data : numpy.ndarray
+            Copy of the contents of rolling buffer, ordered from oldest to newest row
+
+        Notes
+        -----
+        Hot paths should index `_buf_data` directly via `rows` rather than use this method, as the ring must be
+        unrolled into a new array.
+        """
+        return self._buf_data[self.rows(self._logical_rows)]
+
+    @property
+    def filled(self):
+        """Indicates if buffer has been filled
+
+        Returns
+        -------
+        has_filled : bool
+            If True, buffer has appended a number of data columns equal to or greater than size and has filled.
+            If False, buffer has appended fewer than size data columns
+        """
+        return self._n >= self._size
+
+    @property
+    def n(self):
+        """Number of data columns appended
+
+        Returns
+        -------
+        n : int
+            Number of data columns that have been appended.
+        """
+        return self._n
+
+
 class stagingbuffer(sndaqbuffer):
     def __init__(self, size, ndom=5160, dtype=np.uint8, mult=2):
         super().__init__(size, ndom, dtype)
         self._mult = mult
         self._buflen = self._size * self._mult
-        self.clear()
+        self._data = np.zeros(shape=(self._ndom, self._buflen),
+                              dtype=self._dtype)
+        self._idx = self._size
 
     def add(self, val, idx_row, idx_col):
         np.add.at(self._data, (idx_row, self._idx - self._size + idx_col), val)
@@ -153,21 +305,23 @@ class stagingbuffer(sndaqbuffer):
         return self
 
     def advance(self):
+        # Columns past the back of the window are never added to, and are zeroed in bulk by _reset, so the new back
+        #   column is already empty. This avoids an ndom-strided store on every advance
         if self._idx >= self._buflen:
             self._reset()
-        self._data[:, self._idx] = 0
         self._idx += 1
         return self
 
     def clear(self):
-        self._data = np.zeros(shape=(self._ndom, self._buflen),
-                              dtype=self._dtype)
+        # Zero in-place, so views previously taken from this buffer remain valid and no allocation is needed
+        self._data.fill(0)
         self._idx = self._size
 
     def _reset(self):
         self._idx = self._size-1
         # self._idx = 1
         self._data[:, :self._idx] = self._data[:, -self._idx:]
+        self._data[:, self._idx:] = 0
 
     def __getitem__(self, key):
         return self.data[key]
@@ -2,18 +2,38 @@
 """
 import argparse
 import sys
-import json
 import os
+import copy
+import functools
+
+try:
+    import orjson as json
+except ImportError:
+    import json
 
-from sndaq.analysis import AnalysisConfig
-from sndaq.main import launch as launch_sndaq
 from sndaq import base_path
 from sndaq.logger import get_logger
 
+# Default analysis configs for each type of fast response request
+_ana_conf_paths = {
+    'ccsn': os.path.join(base_path, 'etc/ccsn_fra.ini'),
+    'merger': os.path.join(base_path, 'etc/merger_fra.ini'),
+}
+_default_ana_conf_path = os.path.join(base_path, 'etc/analysis.ini')
+
 _no_arg_commands = []
 _command_parsers = {}
 
-logger = get_logger()
+# Command names and descriptions, in the order they are listed by `sndaq --help`
+_commands = {
+    'process': "Process a specific chunk of SN Data",
+    'process-json': "Process a chunk of SN Data, specified by a JSON",
+    'stop': 'Stop SNDAQ',
+}
+
+# Request types accepted by the `process` command
+_process_types = ('ccsn', 'merger', 'manual')
+_process_type_help = f'Request type, choices are: {", ".join(_process_types)}'
 
 class _CustomUsageFormatter(argparse.HelpFormatter):
     """Custom formatter to clarify SNDAQ command usage
@@ -68,7 +88,7 @@ def _setup_stop_parser(subparsers):
         argparse subparsers object
     """
     name = 'stop'
-    desc = 'Stop SNDAQ'
+    desc = _commands[name]
     _setup_command_parser(subparsers, name, desc, has_args=False)
 
 
@@ -81,16 +101,15 @@ def _setup_process_parser(subparsers):
         argparse subparsers object
     """
     name = "process"
-    desc = "Process a specific chunk of SN Data"
-    choices = ('ccsn', 'merger', 'manual')
+    desc = _commands[name]
     parser = _setup_command_parser(subparsers, name, desc)
 
     parser.add_argument('t_start', metavar='START_TIME', default=None,
                         help='start time [YYYY-MM-DDThh:mm:ss.fffff]')
     parser.add_argument('t_stop', metavar='STOP_TIME', default=None,
                         help='stop time [YYYY-MM-DDThh:mm:ss.fffff]')
-    parser.add_argument('type', choices=choices, metavar='TYPE', default=None,
-                        help=f'Request type, choices are: {", ".join(choices)}')
+    parser.add_argument('type', choices=_process_types, metavar='TYPE', default=None,
+                        help=_process_type_help)
     parser.add_argument('--conf', metavar='CONFIG_FILE', default=None,
                         help='Config. file for additional options')
 
@@ -104,13 +123,59 @@ def _setup_process_json_parser(subparsers):
         argparse subparsers object
     """
     name = "process-json"
-    desc = "Process a chunk of SN Data, specified by a JSON"
+    desc = _commands[name]
     parser = _setup_command_parser(subparsers, name, desc)
 
     parser.add_argument('json', metavar='JSON', default=None,
                         help='JSON {"use_offsets": "True", "fr_type": "CCSN", ...}')
 
 
+_command_setup = {
+    'process': _setup_process_parser,
+    'process-json': _setup_process_json_parser,
+    'stop': _setup_stop_parser,
+}
+
+
+def _sniff_subcommand(argv):
+    """Find the SNDAQ command named on the command line, without parsing it
+
+    Parameters
+    ----------
+    argv : list of str
+        Command line arguments, excluding the program name
+
+    Returns
+    -------
+    command : str or None
+        Name of the requested SNDAQ command, or None if the first non-flag argument is not a known command
+    """
+    for arg in argv:
+        if not arg.startswith('-'):
+            return arg if arg in _commands else None
+    return None
+
+
+@functools.lru_cache(maxsize=8)
+def _load_ana_conf(conf_path, mtime_ns):
+    """Load analysis configuration from file, caching the result
+
+    Parameters
+    ----------
+    conf_path : str
+        Path to file containing analysis configuration
+    mtime_ns : int
+        Modification time of `conf_path` in ns, so that the cached configuration is reloaded if the file changes
+
+    Returns
+    -------
+    ana_conf : sndaq.analysis.AnalysisConfig
+        Analysis configuration. This is shared between calls and should be copied before it is modified.
+    """
+    from sndaq.analysis import AnalysisConfig
+    return AnalysisConfig.from_config(conf_path=conf_path)
+
+
 def _process_json(args):
     """Execute SNDAQ `process-json` command
 
@@ -124,25 +189,34 @@ def _process_json(args):
     The following may be used to dump the contents of a json file:
         `sndaq process-json "$(<path/to/somefile.json)"`
     """
+    # Deferred, as these pull in the numerical dependencies, which are not needed by the other commands or help
+    from sndaq.main import launch as launch_sndaq
+
+    logger = get_logger()
     data_json = args.json
-    data = json.loads(data_json.replace("'", '"'))
-
-    if data['fr_type'].lower() == 'ccsn':
-        logger.debug("Using default ccsn request config")
-        ana_conf_path = os.path.join(base_path, 'etc/ccsn_fra.ini')
-    elif data['fr_type'].lower() == 'merger':
-        logger.debug("Using default merger request config")
-        ana_conf_path = os.path.join(base_path, 'etc/merger_fra.ini')
+    try:
+        data = json.loads(data_json)
+    except ValueError:
+        # Requests may be sent with single-quoted strings, which are not valid JSON
+        data = json.loads(data_json.replace("'", '"'))
+
+    fr_type = data['fr_type'].lower()
+    ana_conf_path = _ana_conf_paths.get(fr_type)
+    if ana_conf_path is not None:
+        logger.debug(f"Using default {fr_type} request config")
     else:
         logger.warning(f"Unknown configuration '{data['fr_type']}' requested")
-        ana_conf_path = os.path.join(base_path, 'etc/analysis.ini')
+        ana_conf_path = _default_ana_conf_path
 
-    if not os.path.exists(ana_conf_path):
+    try:
+        mtime_ns = os.stat(ana_conf_path).st_mtime_ns
+    except FileNotFoundError:
         msg = f"Analysis Config `{ana_conf_path}` not found"
         logger.error(msg)
-        raise FileNotFoundError(msg)
+        raise FileNotFoundError(msg) from None
 
-    ana_conf = AnalysisConfig.from_config(conf_path=ana_conf_path)
+    # The cached config is copied, as its fields are overwritten by the request below
+    ana_conf = copy.copy(_load_ana_conf(ana_conf_path, mtime_ns))
     if not ana_conf:
         msg = f"Analysis Config `{ana_conf_path}` is blank"
         logger.error(msg)
@@ -173,12 +247,16 @@ def main():
         dest='command'
     )
 
-    # These functions extend the `subparsers` object in-place
+    # Only the requested command's parser is built in full, the others are listed by name for the help message
+    # The setup functions extend the `subparsers` object in-place
     # They also extend the list `_no_arg_commands` and dict `_command_parsers`
     # This was done for the sake of readability
-    _setup_process_parser(subparsers)
-    _setup_process_json_parser(subparsers)
-    _setup_stop_parser(subparsers)
+    command = _sniff_subcommand(sys.argv[1:])
+    for name, desc in _commands.items():
+        if name == command:
+            _command_setup[name](subparsers)
+        else:
+            subparsers.add_parser(name, help=desc)
 
     # If no arguments or commands are provided, print the top-level help message
     if len(sys.argv) == 1:
@@ -196,8 +274,9 @@ def main():
 
     args = parser.parse_args()
 
-    #TODO: Figure out how to prevent instancing logger upon calls to help from cli or invalid commands
-    # I think this can be done by importing conditionally.
+    # The logger is only instanced once a valid command has been parsed, so help and invalid commands do not roll
+    #   over the log file
+    logger = get_logger()
     if args.command == 'stop':
         logger.info('SNDAQ Stopped!')
     elif args.command == 'process-json':
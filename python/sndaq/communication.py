@@ -3,11 +3,15 @@
 import warnings
 import os
 import json
-from urllib.parse import urlencode
-from urllib.request import urlopen, Request
 import numpy as np
 import datetime
-import time
+import functools
+import threading
+import re
+from urllib.parse import urlencode, urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import InsecureRequestWarning
 
 from sndaq.logger import get_logger
 
@@ -21,22 +25,75 @@ try:
     from livecore.messaging.moniclient import ZMQMoniClient
 except ImportError as e:
     # If running on any system other than SP(T)S only throw a warning; else, raise an excception
-    if not any([host in os.uname()[1].lower() for host in ['spts', 'sps']]):
+    hostname = os.uname()[1].lower()
+    if not any(host in hostname for host in ('spts', 'sps')):
         warnings.warn("Missing Livecore! sndaq.communications will not be properly initialized")
     else:
         raise ImportError(e) from None
 
-# Certificate validation may fail at SP(T)S, in which case you can bypass it like so:
-import ssl
-ssl._create_default_https_context = ssl._create_unverified_context
+# Format of times in I3Live queries
+_live_time_format = '%Y-%m-%d %H:%M:%S'
 
+# Guards creation of the singletons below, so concurrent first calls construct only one instance
+_instance_lock = threading.Lock()
 
-_i3user, _i3pass = get_i3creds()
 
-_default_query_params = {
-            'user': _i3user,
-            'pass': _i3pass
-        }
+@functools.lru_cache(maxsize=1)
+def _get_encoded_credentials():
+    """Get URL-encoded IceCube credentials included in every I3Live request, retrieving them on first use
+
+    Returns
+    -------
+    credentials : str
+        Credentials, encoded as form data
+    """
+    i3user, i3pass = get_i3creds()
+    return urlencode({
+        'user': i3user,
+        'pass': i3pass
+    })
+
+
+@functools.lru_cache(maxsize=1)
+def _get_http_session():
+    """Get HTTP session used for I3Live requests
+
+    Returns
+    -------
+    session : requests.Session
+        Session shared by all I3Live requests, so connections are kept alive and reused between queries
+
+    Notes
+    -----
+    Certificate validation may fail at SP(T)S, so it is bypassed. This is done only for I3Live requests, rather than
+    by replacing the default HTTPS context for the whole process. See also `_ignore_insecure_request_warning`
+    """
+    session = requests.Session()
+    session.verify = False
+    # Requests are sent as pre-encoded form data, see query_live_json_view
+    session.headers['Content-Type'] = 'application/x-www-form-urlencoded'
+    session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=4))
+    return session
+
+
+@functools.lru_cache(maxsize=None)
+def _ignore_insecure_request_warning(host):
+    """Ignore urllib3 warnings on unverified HTTPS requests to an I3Live host
+
+    Parameters
+    ----------
+    host : str
+        Host of I3Live requests
+
+    Notes
+    -----
+    Warning filters are process-wide and not thread-safe to toggle, so the filter is registered once per host rather
+    than around each request. It matches only the warning for this host, so unverified requests made to other hosts
+    by the rest of the process are still reported.
+    """
+    warnings.filterwarnings('ignore', message=f"Unverified HTTPS request is being made to host '{re.escape(host)}'",
+                            category=InsecureRequestWarning, module='urllib3')
+
 
 def get_unique_id():
     """Generate Unique request ID if none is provided
@@ -47,6 +104,88 @@ def get_unique_id():
     return unique_id()
 
 
+def _get_run_info_cache_dir():
+    """Get the default directory of the on-disk run information cache
+
+    Returns
+    -------
+    cache_dir : str
+        Directory `sndaq/run_info` in the per-user cache directory, $XDG_CACHE_HOME or ~/.cache if it is not set
+
+    Notes
+    -----
+    Information on completed runs is kept on disk, so reprocessing a run does not depend on I3Live
+    """
+    user_cache_dir = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache')
+    return os.path.join(user_cache_dir, 'sndaq', 'run_info')
+
+
+def _load_run_info(cache_dir, run_number):
+    """Load information on a completed run from the on-disk cache
+
+    Parameters
+    ----------
+    cache_dir : str
+        Directory of the run information cache
+    run_number : int
+        Number of run for which data is retrieved
+
+    Returns
+    -------
+    run_info : dict or None
+        Dictionary containing run information, or None if the run is not cached.
+        Cache files that cannot be decoded are removed, so they are replaced on the next save.
+    """
+    path = os.path.join(cache_dir, f'{run_number}.json')
+    try:
+        with open(path) as cache_file:
+            run_info = json.load(cache_file)
+    except FileNotFoundError:
+        return None
+    except OSError as err:
+        logger.warning(f"Unable to read cached info for run {run_number}: {err}")
+        return None
+    except ValueError:
+        run_info = None
+
+    if not isinstance(run_info, dict):
+        logger.warning(f"Removing invalid cached info for run {run_number}: {path}")
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        return None
+    return run_info
+
+
+def _save_run_info(cache_dir, run_number, run_info):
+    """Save information on a completed run to the on-disk cache
+
+    Parameters
+    ----------
+    cache_dir : str
+        Directory of the run information cache
+    run_number : int
+        Number of run for which data is saved
+    run_info : dict
+        Dictionary containing run information
+    """
+    path = os.path.join(cache_dir, f'{run_number}.json')
+    # Written to a temporary file then moved into place, so other processes never read a partial file
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(tmp_path, 'w') as cache_file:
+            json.dump(run_info, cache_file)
+        os.replace(tmp_path, path)
+    except (OSError, TypeError, ValueError) as err:
+        logger.warning(f"Unable to cache info for run {run_number}: {err}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
 def query_live_json_view(url, params):
     """Query I3Live databaes via json view.
     NOTE: Requires network connectivity, or a local i3Live server
@@ -57,7 +196,8 @@ def query_live_json_view(url, params):
     url :
         URL of I3Live database, e.g. 'https://i3live/run_info/'
     params : dict
-        Dictionary of parameters to direct request
+        Dictionary of parameters to direct request. IceCube credentials are added to the request, and should not
+        be included.
 
     Returns
     -------
@@ -65,12 +205,12 @@ def query_live_json_view(url, params):
         Dictionary or list of dictionaries containing i3Live response data
 
     """
-    time.sleep(0.1)
-    req = Request(url, urlencode(params).encode())
     logger.debug(f"Sending request to {url}: {params}")
-    with urlopen(req) as response:
-        data = response.read()
-    return json.loads(data)
+    body = f'{urlencode(params)}&{_get_encoded_credentials()}'
+    _ignore_insecure_request_warning(urlsplit(url).hostname)
+    response = _get_http_session().post(url, data=body, timeout=10)
+    response.raise_for_status()
+    return response.json()
 
 
 class RunInfoAgent(object):
@@ -78,25 +218,33 @@ class RunInfoAgent(object):
         """
     instance = None
 
-    def __new__(cls, host=None, force=False, *, run_number=None):
+    def __new__(cls, host=None, force=False, *, run_number=None, cache_dir=None):
         """
 
         Parameters
         ----------
         host : str
             Host where i3Live service is running
+        cache_dir : str or None
+            Directory in which information on completed runs is cached.
+            If None, `sndaq/run_info` in the per-user cache directory is used.
         """
-        if host is None and cls.instance is None:
-            raise RuntimeError("No Host was provided!")
-        elif cls.instance is None:
-            cls.instance = super(RunInfoAgent, cls).__new__(cls)
-            cls.instance.host = host
-            cls.instance.url = f'https://{host}/run_info/'
-            cls.instance.run_number = run_number
-        elif force:
-            cls.instance = None
-            return cls.__new__(cls, host, force=True)
-        return cls.instance
+        instance = cls.instance
+        if instance is not None and not force:
+            return instance
+        with _instance_lock:
+            if cls.instance is None or force:
+                if host is None:
+                    raise RuntimeError("No Host was provided!")
+                # Instance is only published once fully initialized, as it may be read without the lock
+                instance = super(RunInfoAgent, cls).__new__(cls)
+                instance.host = host
+                instance.url = f'https://{host}/run_info/'
+                instance.run_number = run_number
+                instance.cache_dir = cache_dir if cache_dir is not None else _get_run_info_cache_dir()
+                instance._run_info_cache = {}
+                cls.instance = instance
+            return cls.instance
 
     def find_run_number(self, timestamp=None):
         """Find the corresponding run number given a timestamp and selection method
@@ -116,33 +264,31 @@ class RunInfoAgent(object):
             return self.run_number
         # Assumes run duration is ~8 hrs, extra time is added in order to ensure interval includes the correct run
         if timestamp is None:
-            start_time = np.datetime64(datetime.datetime.now().date(), 's')  # 's' is required for proper str formatting
-            stop_time = np.datetime64(datetime.datetime.now().date(), 's') + np.timedelta64(1, 'D')
+            start_time = np.datetime64(datetime.datetime.now().date(), 's')
+            stop_time = start_time + np.timedelta64(1, 'D')
         else:
             start_time = timestamp - np.timedelta64(10, 'h')
             stop_time = timestamp + np.timedelta64(10, 'h')
 
+        # Casting to 's' gives a datetime.datetime for any input precision, and drops fractional seconds
         params = {
-            'start': str(start_time).replace('T', ' '),
-            'stop': str(stop_time).replace('T', ' ')
+            'start': start_time.astype('datetime64[s]').item().strftime(_live_time_format),
+            'stop': stop_time.astype('datetime64[s]').item().strftime(_live_time_format)
         }
-        params.update(_default_query_params)
         data = query_live_json_view(self.url, params)
         if not isinstance(data, list):
             data = [data]
-        run_numbers = np.array([run['run_number'] for run in data])
-        run_starts = np.array([np.datetime64(run['start']) for run in data])
-        run_stops = np.array([np.datetime64(run['stop']) for run in data])
-
-        # When requesting info from an ongoing run, run_stop will be None
-        if np.datetime64("NaT") in run_stops:
-            run_starts = run_starts[run_stops != np.datetime64("NaT")]
-            run_stops = run_stops[run_stops != np.datetime64("NaT")]
-
-        idx = np.where((run_starts < timestamp) & (timestamp < run_stops))[0]
+        n = len(data)
+        run_numbers = np.fromiter((run['run_number'] for run in data), dtype=np.int64, count=n)
+        run_starts = np.array([run['start'] for run in data], dtype='datetime64[us]')
+        # When requesting info from an ongoing run, run_stop will be None, which is parsed as NaT
+        run_stops = np.array([run['stop'] for run in data], dtype='datetime64[us]')
+
+        # Comparisons with NaT are always False, so ongoing runs are never matched
+        idx = np.flatnonzero((run_starts < timestamp) & (timestamp < run_stops))
         if idx.size == 0:
             raise ValueError(f"Unable to find run matching timestamp {timestamp}, closest matches: {run_numbers}")
-        return run_numbers[idx][0]
+        return run_numbers[idx[0]]
 
     def get_run_info(self, run_number):
         """Request information on a run via its run number via json view.
@@ -156,12 +302,25 @@ class RunInfoAgent(object):
         -------
         run_info : dict
             Dictionary containing run information
+
+        Notes
+        -----
+        Information on completed runs does not change, so it is cached in memory and on disk, and only requested
+        once. Ongoing runs, which have no stop time, are requested on every call.
         """
-        params = {
-            'run_number': run_number
-        }
-        params.update(_default_query_params)
-        return query_live_json_view(self.url, params)
+        run_info = self._run_info_cache.get(run_number)
+        if run_info is None:
+            run_info = _load_run_info(self.cache_dir, run_number)
+            if run_info is None:
+                params = {
+                    'run_number': run_number
+                }
+                run_info = query_live_json_view(self.url, params)
+                if not isinstance(run_info, dict) or run_info.get('stop') is None:
+                    return run_info
+                _save_run_info(self.cache_dir, run_number, run_info)
+            self._run_info_cache[run_number] = run_info
+        return dict(run_info)
 
 
 class OfflineMoniClient:
@@ -191,7 +350,10 @@ class LiveMessageSender(object):
     """Singleton Live message sender object
     """
     instance = None
-    _fra_statuses = ['QUEUED', 'IN PROGRESS', 'SUCCESS', 'FAIL']
+    # FRA statuses and the error state reported with each
+    _fra_statuses = {'QUEUED': 0, 'IN PROGRESS': 0, 'SUCCESS': 0, 'FAIL': 1}
+    # FRA statuses reporting progress, rather than the end of a request
+    _fra_progress_statuses = ('QUEUED', 'IN PROGRESS')
 
     def __new__(cls, moni_host=None, moni_port=None, msg=None, offline=False):
         """
@@ -203,16 +365,23 @@ class LiveMessageSender(object):
         moni_port : int
             Port on host where i3Live service is running
         """
-        if cls.instance is None:
-            cls.instance = super(LiveMessageSender, cls).__new__(cls)
-            cls.instance.offline = offline
-            if not cls.instance.offline:
-                cls.instance.sender = ZMQMoniClient(svc='sndaq_fra', moni_host=moni_host, moni_port=moni_port)
-            else:
-                cls.instance.sender = OfflineMoniClient()
-            cls.instance._request_id = None
-            cls.msg = msg
-        return cls.instance
+        instance = cls.instance
+        if instance is not None:
+            return instance
+        with _instance_lock:
+            if cls.instance is None:
+                # Instance is only published once fully initialized, as it may be read without the lock
+                instance = super(LiveMessageSender, cls).__new__(cls)
+                instance.offline = offline
+                if not instance.offline:
+                    instance.sender = ZMQMoniClient(svc='sndaq_fra', moni_host=moni_host, moni_port=moni_port)
+                else:
+                    instance.sender = OfflineMoniClient()
+                instance._request_id = None
+                instance._last_status = None
+                cls.msg = msg
+                cls.instance = instance
+            return cls.instance
 
     @property
     def request_id(self):
@@ -233,19 +402,25 @@ class LiveMessageSender(object):
         -------
 
         """
-        if status not in self._fra_statuses:
-            raise ValueError(f"Unknown status {status}, see member `_fra_statuses` for valid values")
-        elif status == 'QUEUED':
-            err_state = 0
+        try:
+            err_state = self._fra_statuses[status]
+        except KeyError:
+            raise ValueError(f"Unknown status {status}, see member `_fra_statuses` for valid values") from None
+        if status == 'QUEUED':
             self._request_id = request_id
         elif status == 'FAIL':
-            err_state = 1
             pass  # Do something to send error alongside status update
         elif status == 'SUCCESS':
-            err_state = 0
             pass  # Do something to de-register alert with sender
+
+        # Consecutive identical progress updates are not re-sent to I3Live, as they would carry the same status
+        #   Final statuses are always sent, and reset this so the same request may be reported again
+        if status in self._fra_progress_statuses:
+            if (status, request_id) == self._last_status:
+                return err_state
+            self._last_status = (status, request_id)
         else:
-            err_state = 0
+            self._last_status = None
 
         self.msg.update({'status': status, "request_id": request_id})
         self.sender.send_moni(varname='sndaq_fra_info', prio=2, value=self.msg)
@@ -265,6 +440,7 @@ class LiveMessageSender(object):
         -------
 
         """
+        self._last_status = None
         self.msg.update({'status': "SUCCESS", "data": data, "request_id": request_id})
         self.sender.send_moni(varname='sndaq_fra_info', prio=2, value=self.msg)
         logger.info("Sent FR result to i3Live")
@@ -2,29 +2,92 @@
 """
 from sndaq.reader import SN_PayloadReader, PDAQ_PayloadReader
 from sndaq.buffer import stagingbuffer
-from sndaq.util.rebin import rebin_scalers as c_rebin_scalers
 from sndaq.util import utime_to_datetime64
 from sndaq.logger import get_logger
 from sndaq.communication import RunInfoAgent
-from sndaq import get_i3creds
 
 from configparser import ConfigParser
+from numba import njit, types
 import numpy as np
 import glob
+import fnmatch
 import os
 import ast  # TODO: Replace with pyyaml
 
-import ssl
-ssl._create_default_https_context = ssl._create_unverified_context
-
 logger = get_logger()
-_i3user, _i3pass = get_i3creds()
+
+
+# Called by DataHandler.update_buffer for every payload. Compiled eagerly at import from explicit signatures (and
+#   cached to disk), so it is compiled at import rather than while the first payload is being processed
+#   Scalers may be read-only, as np.frombuffer over immutable bytes returns a read-only array
+_scalers_types = [types.Array(types.uint8, 1, 'C', readonly=readonly) for readonly in (False, True)]
+
+
+@njit([types.void(scalers_type, types.int64, types.int64, types.int64, types.int64, types.uint32[::1])
+       for scalers_type in _scalers_types], cache=True)
+def _rebin_scalers_kernel(scalers, utime, raw_utime0, raw_udt, scaler_udt, raw_counts):
+    """Rebin scalers to 2 ms in a single pass over the payload
+
+    Parameters
+    ----------
+    scalers : numpy.ndarray of uint8
+        SN scalers of one payload, in 1.6384 ms bins
+    utime : int
+        Time payload begins in 0.1 ns since start of year
+    raw_utime0 : int
+        Time the first 2 ms bin of the destination begins, bins are uniformly spaced by raw_udt
+    raw_udt, scaler_udt : int
+        Width of 2 ms bins and scaler bins, in 0.1 ns
+    raw_counts : numpy.ndarray of uint32
+        Destination 2 ms bins, updated in-place
+    """
+    n = raw_counts.size
+    for i in range(scalers.size):
+        scaler = scalers[i]
+        if scaler == 0:
+            continue
+        scaler_utime = utime + i * scaler_udt
+        # Last 2 ms bin starting strictly before the scaler, equivalent to searchsorted(side='left') - 1
+        idx = (scaler_utime - raw_utime0 - 1) // raw_udt
+        idx = min(max(idx, 0), n - 1)
+        raw_counts[idx] += scaler
+
+        # Move the fraction of a scaler extending past the end of its 2 ms bin into the next bin
+        raw_utime_end = raw_utime0 + (idx + 1) * raw_udt
+        if scaler_utime + scaler_udt > raw_utime_end and scaler_utime < raw_utime_end and idx + 1 < n:
+            frac = 1. - ((raw_utime_end - scaler_utime) / scaler_udt)
+            frac_count = np.uint32(0.5 + frac * scaler)
+            raw_counts[idx] -= frac_count
+            raw_counts[idx + 1] += frac_count
+
+
+def _uniform_bin_index(t, t0, dt, nbins):
+    """Index of the first of nbins uniformly spaced bin edges at or after each time
+
+    Parameters
+    ----------
+    t : numpy.ndarray of int
+        Times to index
+    t0 : int
+        Time of the first bin edge, edges are uniformly spaced by dt
+    dt : int
+        Bin width, in the same units as t
+    nbins : int
+        Number of bins
+
+    Returns
+    -------
+    idx : numpy.ndarray of int
+        Equivalent to searchsorted(side='left') on the bin edges, found by ceiling division so that the edges need
+        not be built. Times after the last edge are clipped to the last bin, rather than indexing past the end
+    """
+    return np.clip(-((t0 - t) // dt), 0, nbins - 1)
 
 
 class DataHandler:
     """Handler for SN scaler data files
     """
-    def __init__(self, ndom=5160, dtype=np.uint16, livehost=None, *, run_number=None):
+    def __init__(self, ndom=5160, dtype=np.uint16, livehost=None, *, run_number=None, run_info_cache_dir=None):
         """Create DataHandler object
 
         Parameters
@@ -33,6 +96,8 @@ class DataHandler:
             Number of contributing DOMs
         dtype
             Data type for SN scaler arrays
+        run_info_cache_dir : str or None
+            Directory in which information on completed runs is cached, see `sndaq.communication.RunInfoAgent`
         """
 
         self._scaler_udt = int(250 * 2**16)
@@ -43,7 +108,8 @@ class DataHandler:
         self._payloads_read = np.zeros(5160, dtype=np.uint32)
 
         self._data = stagingbuffer(size=self._staging_depth, ndom=ndom, dtype=dtype)  #np.zeros((ndom, self._staging_depth), dtype=dtype)
-        self._raw_utime = np.zeros(self._staging_depth, dtype=np.uint32)
+        self._raw_utime = 0  # Time at which the first 2 ms bin of the staging buffer begins, bins are _raw_udt apart
+        self._raw_counts = np.zeros(self._staging_depth, dtype=np.uint32)  # Scratch space for rebin_scalers
 
         self._scaler_file = None
         self._scaler_file_glob = None
@@ -55,7 +121,8 @@ class DataHandler:
         self._pdaqtrigger_file_glob = None
 
         # TODO: Host must be configurable
-        self._run_info_agent = RunInfoAgent(host=livehost, force=False, run_number=run_number)
+        self._run_info_agent = RunInfoAgent(host=livehost, force=False, run_number=run_number,
+                                             cache_dir=run_info_cache_dir)
         self._run_number = run_number
 
     @classmethod
@@ -84,9 +151,10 @@ class DataHandler:
         # Default arguments specified in init
         livehost = ast.literal_eval(conf['i3live'].get('host', None))
         run_number = conf['i3live'].getint('run_number', None)
+        run_info_cache_dir = ast.literal_eval(conf['i3live'].get('run_info_cache_dir', 'None'))
 
         try:
-            return cls(livehost=livehost, run_number=run_number)
+            return cls(livehost=livehost, run_number=run_number, run_info_cache_dir=run_info_cache_dir)
         except TypeError as err:
             msg = str(err)
             bad_field = msg.split('\'')[-2]
@@ -155,23 +223,35 @@ class DataHandler:
             # run_start = np.datetime64(run_info['start'])
 
         # Find Corresponding Scaler files
-        self._scaler_file_glob = sorted(
-            glob.glob('/'.join((directory, scaler_file_pattern.format(run_number=self._run_number)))))
-
         logger.debug(f"Searching for files matching pattern {'/'.join((directory, scaler_file_pattern))}")
         logger.debug(f"start_time={start_time} stop_time={stop_time}")
+        # Matching is done on file names from a single directory scan, so the file index can be parsed from the name
+        #   without splitting each path again
+        with os.scandir(directory) as entries:
+            scaler_file_names = sorted(fnmatch.filter((entry.name for entry in entries),
+                                                      scaler_file_pattern.format(run_number=self._run_number)))
+        self._scaler_file_glob = ['/'.join((directory, name)) for name in scaler_file_names]
 
         # Estimate scaler file times
-        idc = np.array([int(os.path.basename(file).split('_')[2]) for file in self._scaler_file_glob])
+        idc = np.fromiter((int(name.split('_')[2]) for name in scaler_file_names), dtype=np.int64,
+                          count=len(scaler_file_names))
 
         # TODO: Revisit getting file times based on run start time
         # if self._use_real_run_no:
         #     file_times = np.timedelta64(60, 's') * idc + run_start  # Each file is about a minute
         # else:
-        self.set_scaler_file(self._scaler_file_glob[0])
-        self.read_payload()
-        data_start = utime_to_datetime64(self.payload.utime, start_time.astype('datetime64[Y]').item().year)
-        file_times = np.timedelta64(60, 's') * idc + data_start
+        # Empty files, such as one still being opened by the DAQ, are skipped. Times are estimated relative to the
+        #   first file, so the time of the first payload found is offset by the number of files skipped
+        for i, filename in enumerate(self._scaler_file_glob):
+            first_utime = SN_PayloadReader.peek_first_utime(filename)
+            if first_utime is not None:
+                break
+        else:
+            err_msg = f"No SN scaler payloads found in files matching {'/'.join((directory, scaler_file_pattern))}"
+            logger.error(err_msg)
+            raise RuntimeError(err_msg)
+        data_start = utime_to_datetime64(first_utime, start_time.astype('datetime64[Y]').item().year)
+        file_times = np.timedelta64(60, 's') * (idc - (idc[i] - idc[0])) + data_start
 
         # search between [t_sw - (t_bkg_t + 1 min), t_sw + t_bkg_l + 1min], extra 2 min to ensure file selection
         t0 = start_datetime - (np.timedelta64(buffer_time_t, 'ms') + np.timedelta64(1, 'm'))
@@ -260,8 +340,7 @@ class DataHandler:
     def advance_buffer(self):
         """Roll front of staging buffer off the end, add empty space at back
         """
-        self._raw_utime += self._raw_udt  # TODO: Decide if this could instead be tracked as integer of first bin utime
-        # Can this rolling operation be done with np.add.at(data[1:]-data[:-1], arange(1, data.size-1)?
+        self._raw_utime += self._raw_udt
         self._data.advance()
 
     def update_buffer(self, idx_dom):
@@ -276,7 +355,7 @@ class DataHandler:
         -----
         It is assumed that idx_dom corresponds to the current payload contained by _pay
         """
-        data, idx_data = c_rebin_scalers(self._raw_utime[0], self._pay.utime, self._pay.scaler_bytes)
+        data, idx_data = self.rebin_scalers(self._pay.utime, self._pay.scalers)
         if data.size > 0:
             self._data.add(data, idx_dom, idx_data)
         self._payloads_read[idx_dom] += 1
@@ -288,8 +367,8 @@ class DataHandler:
         ----------
         utime : int
             Time payload in 0.1 ns since start of year
-        scaler_bytes : bytearray
-            Binary scaler hit data
+        scaler_bytes : bytearray | numpy.ndarray of uint8
+            Binary scaler hit data, or a uint8 view of it such as `sndaq.reader.SN_Payload.scalers`
 
         Returns
         -------
@@ -300,33 +379,25 @@ class DataHandler:
 
         Notes
         -----
-        Could be changed to increment bin time as np.uint16 rather than thru array elements
+        Scalers beginning before the staging buffer are added to its first bin, and those beginning after its end
+        are added to its last bin. Unlike `sndaq.util.rebin.rebin_scalers`, the fraction of the final scaler
+        extending into the next 2 ms bin is kept.
         """
-        scalers = np.frombuffer(scaler_bytes, dtype=np.uint8)
-        idx_sclr = scalers.nonzero()[0]
-        if idx_sclr.size == 0:
+        if isinstance(scaler_bytes, np.ndarray):
+            scalers = scaler_bytes
+        else:
+            scalers = np.frombuffer(scaler_bytes, dtype=np.uint8)
+        if not scalers.any():
             return np.array([]), np.array([])
 
-        raw_counts = np.zeros(self._staging_depth, dtype=np.uint8)
-        scaler_utime = utime + idx_sclr*self._scaler_udt
-        idx_raw = self._raw_utime.searchsorted(scaler_utime, side="left") - 1
-        np.add.at(raw_counts, idx_raw, scalers[idx_sclr])
-        # Duplicate entries in idx_base (when two 1.6ms bins have bin starts in same 2ms bin) must be added
-        # like so, not via base_counts[idx_base] += scalers[idx_sclr] which only performs addition for first idx
-        # idx_base
-
-        cut = (scaler_utime + self._scaler_udt > self._raw_utime[idx_raw] + self._raw_udt) & \
-              (scaler_utime < self._raw_utime[idx_raw] + self._raw_udt)
-        idx_raw = idx_raw[cut]
-        idx_sclr = idx_sclr[cut]
-
-        frac = 1. - ((self._raw_utime[idx_raw] + self._raw_udt - scaler_utime[cut])/self._scaler_udt)
-        raw_counts[idx_raw] -= np.uint8(0.5+frac*scalers[idx_sclr])
-        raw_counts[idx_raw+1] += np.uint8(0.5+frac*scalers[idx_sclr])
+        raw_counts = self._raw_counts
+        _rebin_scalers_kernel(scalers, int(utime), self._raw_utime, self._raw_udt, self._scaler_udt, raw_counts)
 
         # Passing arrays like this may increase overhead and reduce efficiency
         idx_raw = raw_counts.nonzero()[0]
-        return raw_counts[idx_raw], idx_raw
+        counts = raw_counts[idx_raw]
+        raw_counts[idx_raw] = 0
+        return counts, idx_raw
 
     @property
     def raw_dt(self):
@@ -388,25 +459,27 @@ class DataHandler:
         """
         t0 = None
         rebin_factor = cand.trigger.binsize // 500
-        trigger_utime = (cand.trigger.t - cand.trigger.t.astype('datetime64[Y]')).astype('timedelta64[ns]').astype(int)
+        # Times are handled as integer ns since the start of the trigger's year, so each file's payload times need
+        #   only a view and one subtraction
+        year_start = cand.trigger.t.astype('datetime64[Y]').astype('datetime64[ns]').astype(np.int64)
+        trigger_utime = cand.trigger.t.astype('datetime64[ns]').astype(np.int64) - year_start
         udt = int(500e6)  # 500 ms, in ns
 
         # TODO: Make this bases this on config or duration of files. currently this assumes ~60 s per rate file
-        nbins = 2 * 60 * len(cand.rmu_files+1)
+        nbins = 2 * 60 * (len(cand.rmu_files) + 1)
         rmu_base = np.zeros(nbins)
-        utime_binned = np.arange(nbins) * udt
 
         for file in cand.rmu_files:
             # TODO: Change this to reference class member (IE self.pdaqtrigger_reader) for configured data sources
             with PDAQ_PayloadReader(file) as rdr:
                 rmu = rdr.read_payloads()
-            utime = (rmu['t'] - rmu['t'].astype('datetime64[Y]')).astype(int)
+            utime = rmu['t'].view(np.int64) - year_start
             if not t0:
                 # This ensures bin edges align with trigger bin edge
                 t0 = trigger_utime - udt * (1 + (trigger_utime - utime[0])//udt)
 
-            idx = utime_binned.searchsorted(utime - t0)
-            np.add.at(rmu_base, idx, rmu['rmu'])
+            idx = _uniform_bin_index(utime, t0, udt, nbins)
+            rmu_base += np.bincount(idx, weights=rmu['rmu'], minlength=nbins)
 
         # TODO: Make this based on config, rather than hardcoded 500 (ms)
         idx = np.arange(nbins).reshape(-1, 1) + np.arange(rebin_factor)
@@ -108,12 +108,12 @@ def main(*args, **kwargs):
             if dh._start_utime is None and utime is not None:  # First file opening in processing run
                 dh._start_utime = utime
                 ana.set_start_time(utime_to_datetime64(utime, year=start_time.item().year))
-                dh._raw_utime = np.arange(utime, utime + (dh._raw_udt * dh._staging_depth), dh._raw_udt)
+                dh._raw_utime = utime
 
             while dh.payload is not None and ana.trigger_time() < stop_time:
 
                 # Add to the current 2ms bin until it has filled...
-                while dh.payload is not None and dh.payload.utime <= dh._raw_utime[1]:
+                while dh.payload is not None and dh.payload.utime <= dh._raw_utime + dh._raw_udt:
 
                     # Skip IceTop
                     if not i3.isvalid_dom(dh.payload.dom_id):
@@ -148,19 +148,17 @@ class SN_Payload(object):
             self.__has_data = False
 
         if self.__has_data:
-            # Read SN Payload fields from bytes.
-            scaler_len = len(data) - 18
-            flds = struct.unpack(">QHH6B{0:d}B".format(scaler_len), data)
+            # Read SN Payload header fields from bytes. Scaler data follows the header, and is left as bytes to be
+            #   viewed as an array by `scalers`, rather than unpacked into one Python int per scaler
+            flds = struct.unpack_from(">QHH6B", data)
             # > - Big endian
             # Q  - integer (8 bytes) - DOM mainboard ID, flds[0]
             # H  - integer (2 bytes) - record length in bytes (10+scaler_len), flds[1]
             # H  - integer (2 bytes) - SN record MAGIC NUMBER, flds[2]
             # 6B - 6 integers (1 byte each) - DOM Clock bytes, flds[3:9]
-            # {0:d}B - scaler_len integers (1 byte each) - scaler data, flds[9:]
 
             self.__dom_id = flds[0]
             self.__clock_bytes = flds[3:9]
-            self.__scaler_bytes = flds[9:]
 
     @staticmethod  # Decorator allows this method to be called without initializing the object
     def extract_clock_bytes(clock_bytes):
@@ -192,7 +190,7 @@ class SN_Payload(object):
 
     def __str__(self) -> str:
         return "Supernova@{0:d}[dom {1:012x} clk {2:012x} scalerData*{3:d}".format(
-            self.utime, self.__dom_id, self.domclock, len(self.__scaler_bytes)
+            self.utime, self.__dom_id, self.domclock, self.scaler_length
         )
 
     def __eq__(self, other):
@@ -304,6 +302,21 @@ class SN_Payload(object):
         else:
             return self.__data[SN_HEADER_LENGTH:]
 
+    @property
+    def scalers(self):
+        """Payload scalers
+
+        Returns
+        -------
+        scalers : numpy.ndarray of uint8 | None
+            Read-only view of the payload scalers, without copying the payload data
+            If this payload was constructed with keep_data=False, this will return None
+        """
+        if not self.has_data:
+            return None
+        else:
+            return np.frombuffer(self.__data, dtype=np.uint8, offset=SN_HEADER_LENGTH)
+
     @property
     def scaler_length(self):
         """Number of data bytes
@@ -434,6 +447,26 @@ class SN_PayloadReader(Reader):
 
         return SN_Payload(utime, rawdata, keep_data=keep_data)
 
+    @classmethod
+    def peek_first_utime(cls, filename):
+        """Read the time of the first payload in a file, without decoding the payload
+
+        Parameters
+        ----------
+        filename : str
+            Name of SN scaler payload file
+
+        Returns
+        -------
+        utime : int or None
+            UTC Timestamp of first payload in units 0.1 ns since start of year, or None if the file is empty
+        """
+        with cls(filename, keep_data=False) as rdr:
+            envelope = rdr._fin.read(SN_ENVELOPE_LENGTH)
+        if len(envelope) < SN_ENVELOPE_LENGTH:
+            return None
+        return struct.unpack(">iiq", envelope)[2]
+
 
 class PDAQ_PayloadReader(Reader):
     """Reader for PDAQ SMT8 trigger rate data"""
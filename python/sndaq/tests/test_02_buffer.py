@@ -1,6 +1,6 @@
 import unittest
 import numpy as np
-from sndaq.buffer import sndaqbuffer, windowbuffer
+from sndaq.buffer import sndaqbuffer, windowbuffer, ringbuffer, stagingbuffer
 
 
 class testSndaqBuffer(unittest.TestCase):
@@ -47,6 +47,30 @@ class TestWindowBuffer(unittest.TestCase):
         buffer.append(values)
         self.assertTrue(np.all(buffer[-1] == values))
 
+    def test_clear(self):
+        """Clear buffer in-place
+        """
+        size = 20
+        ndom = 40
+        buffer = windowbuffer(size=size, ndom=ndom)
+        data = buffer._data
+        buffer.append(np.ones(ndom, dtype=np.uint16))
+        buffer.clear()
+        self.assertIs(buffer._data, data)
+        self.assertFalse(np.any(buffer.data))
+        self.assertEqual(buffer._idx, size)
+
+    def test_windows(self):
+        """Gather rows at logical indices
+        """
+        size = 5
+        ndom = 10
+        buffer = windowbuffer(size=size, ndom=ndom)
+        for n in range(1, 3 * size + 3):
+            buffer.append(n * np.ones(ndom, dtype=np.uint16))
+        idx = np.array([[0, 4], [2, 3]])
+        self.assertTrue(np.all(buffer.windows(idx) == buffer.data[idx]))
+
     def test_reset(self):
         """Buffer reset
         """
@@ -74,3 +98,132 @@ class TestWindowBuffer(unittest.TestCase):
             n += 1
         self.assertEqual(buffer._idx, size*2)
 
+
+class TestRingBuffer(unittest.TestCase):
+
+    def test_init(self):
+        """Ring buffer initialization
+        """
+        buffer = ringbuffer(20)
+        self.assertEqual(buffer._ndom, 5160)
+        self.assertEqual(buffer._buflen, 32)
+        self.assertEqual(buffer._mask, 31)
+        self.assertEqual(buffer._buf_head, 0)
+        self.assertIs(buffer._dtype, np.uint16)
+        self.assertFalse(np.any(buffer.data))
+
+    def test_size(self):
+        """Buffer size allocation
+        """
+        size = 20
+        ndom = 40
+        buffer = ringbuffer(size=size, ndom=ndom)
+        self.assertEqual(buffer._size, size)
+        self.assertEqual(buffer.data.shape, (size, ndom))
+        self.assertEqual(ringbuffer(size=16, ndom=ndom)._buflen, 16)
+
+    def test_append(self):
+        """Append to buffer
+        """
+        size = 20
+        ndom = 40
+        buffer = ringbuffer(size=size, ndom=ndom)
+        values = np.asarray(np.random.randint(0, 255, size=ndom), dtype=np.uint16)
+        buffer.append(values)
+        self.assertTrue(np.all(buffer[-1] == values))
+        self.assertTrue(np.all(buffer._buf_data[buffer.rows(size - 1)] == values))
+
+    def test_wrap(self):
+        """Logical ordering is preserved as the ring wraps
+        """
+        size = 5
+        ndom = 10
+        buffer = ringbuffer(size=size, ndom=ndom)
+        for n in range(1, 3 * buffer._buflen + 3):
+            buffer.append(n * np.ones(ndom, dtype=np.uint16))
+
+        expected = np.arange(n - size + 1, n + 1).reshape(-1, 1) * np.ones(ndom, dtype=np.uint16)
+        self.assertTrue(np.all(buffer.data == expected))
+        self.assertTrue(np.all(buffer[1:3, 0] == expected[1:3, 0]))
+        self.assertTrue(np.all(buffer._buf_data[buffer.rows(np.arange(size))] == expected))
+        self.assertTrue(np.all(buffer.windows(np.array([[0, 4], [2, 3]])) == expected[[[0, 4], [2, 3]]]))
+        self.assertEqual(buffer.n, n)
+        self.assertTrue(buffer.filled)
+
+    def test_get(self):
+        """Indexing by row and column matches indexing the unrolled buffer
+        """
+        size = 5
+        ndom = 10
+        buffer = ringbuffer(size=size, ndom=ndom)
+        for n in range(1, 13):
+            buffer.append(np.arange(ndom, dtype=np.uint16) + 100 * n)
+
+        data = buffer.data
+        for key in (0, -1, 3, slice(1, 4), slice(None, None, -2), (2, 7), (-2, slice(3, 6)), (slice(-3, None), 1)):
+            self.assertTrue(np.array_equal(buffer[key], data[key]), f"Mismatch at {key}")
+        with self.assertRaises(IndexError):
+            buffer[size]
+
+    def test_clear(self):
+        """Clear buffer in-place, and reset the count of appended rows
+        """
+        size = 5
+        ndom = 10
+        buffer = ringbuffer(size=size, ndom=ndom, cumulative=True)
+        data = buffer._buf_data
+        for n in range(1, 9):
+            buffer.append(n * np.ones(ndom, dtype=np.uint16))
+        self.assertTrue(buffer.filled)
+
+        buffer.clear()
+        self.assertIs(buffer._buf_data, data)
+        self.assertFalse(np.any(buffer.data))
+        self.assertFalse(np.any(buffer._buf_cum))
+        self.assertEqual(buffer._buf_head, 0)
+        self.assertEqual(buffer.n, 0)
+        self.assertFalse(buffer.filled)
+
+        buffer.append(np.ones(ndom, dtype=np.uint16))
+        self.assertEqual(buffer.n, 1)
+        self.assertTrue(np.all(buffer[-1] == 1))
+        self.assertFalse(np.any(buffer[:-1]))
+
+    def test_cumulative(self):
+        """Running sum gives the sum over any run of logical rows as the ring wraps
+        """
+        size = 16
+        ndom = 10
+        buffer = ringbuffer(size=size, ndom=ndom, cumulative=True)
+        self.assertEqual(buffer._buflen, 32)
+        for n in range(1, 3 * buffer._buflen + 3):
+            buffer.append(n * np.ones(ndom, dtype=np.uint16))
+
+        data = buffer.data.astype(np.int64)
+        for j, k in [(0, size - 1), (3, 3), (2, 9)]:
+            run_sum = buffer._buf_cum[buffer.rows(k)] - buffer._buf_cum[buffer.rows(j - 1)]
+            self.assertTrue(np.all(run_sum == data[j:k + 1].sum(axis=0)))
+
+
+class TestStagingBuffer(unittest.TestCase):
+
+    def test_advance(self):
+        """Window contents are preserved and new back columns are empty as the buffer advances and resets
+        """
+        size = 6
+        ndom = 4
+        buffer = stagingbuffer(size=size, ndom=ndom, dtype=np.uint32)
+        expected = np.zeros((ndom, size), dtype=np.uint32)
+        rng = np.random.default_rng(0)
+        for _ in range(5 * buffer._buflen):
+            idx_row = rng.integers(ndom)
+            idx_col = rng.choice(size, 3, replace=False)
+            val = rng.integers(1, 10, 3)
+            buffer.add(val, idx_row, idx_col)
+            expected[idx_row, idx_col] += val.astype(np.uint32)
+            self.assertTrue(np.all(buffer.data == expected))
+            self.assertTrue(np.all(buffer.front == expected[:, 0]))
+
+            buffer.advance()
+            expected = np.hstack((expected[:, 1:], np.zeros((ndom, 1), dtype=np.uint32)))
+            self.assertTrue(np.all(buffer.data == expected))
@@ -0,0 +1,153 @@
+import unittest
+import numpy as np
+import numpy.testing as npt
+from sndaq.analysis import AnalysisConfig, AnalysisHandler
+from sndaq.trigger import PrimaryTrigger
+
+
+class TestAnalysisHandler(unittest.TestCase):
+
+    def setUp(self):
+        # Window durations are multiples of every binsize, so each window holds a whole number of bins
+        self.ndom = 50
+        self.config = AnalysisConfig(True, True, [500, 1500, 3000], 6000, 6000, 3000, 3000,
+                                     min_active_doms=10, min_bkg_rate=0, max_bkg_rate=1e9,
+                                     min_bkg_fano=0, max_bkg_fano=1e9, max_bkg_abs_skew=10)
+        self.handler = AnalysisHandler(self.config, ndom=self.ndom, eps=np.linspace(0.9, 1.4, self.ndom),
+                                       start_time=np.datetime64('2021-01-01T00:00:00'))
+        self.fill(200)
+
+    def fill(self, lam, nticks=72):
+        rng = np.random.default_rng(0)
+        # Every analysis updates on the last tick, as the number of ticks is a multiple of all rebin factors
+        for _ in range(nticks):
+            self.handler.buffer_analysis.append(rng.poisson(lam, self.ndom))
+            self.handler.update_analyses()
+
+    def test_update_sums(self):
+        """Running sums match sums recomputed from the analysis buffer
+        """
+        self.assert_sums_exact()
+
+    def test_update_sums_large(self):
+        """Running sums remain exact for counts whose squared bins overflow 32-bit integers
+        """
+        self.fill(60000)
+        self.assertTrue(np.any(self.handler.analyses[-1].hit_sum2 > np.iinfo(np.int32).max))
+        self.assert_sums_exact()
+
+    def assert_sums_exact(self):
+        data = self.handler.buffer_analysis.data.astype(np.int64)
+        for ana in self.handler.analyses:
+            rf = ana.rebin_factor
+            bins = np.concatenate((data[ana.idx_bgt:ana.idx_ext], data[ana.idx_bgl:ana.idx_eod]))
+            bins = bins.reshape(-1, rf, self.ndom).sum(axis=1)
+            npt.assert_array_equal(ana.hit_sum, bins.sum(axis=0))
+            npt.assert_array_equal(ana.hit_sum2, (bins * bins).sum(axis=0))
+            npt.assert_array_equal(ana.rate, data[ana.idx_sw:ana.idx_exl].sum(axis=0))
+
+    def test_update_block(self):
+        """Updating from blocks of 2 ms data matches updating one 2 ms row at a time
+        """
+        trigger = self.config._trigger_condition
+        self.addCleanup(trigger.set_trigger_time, trigger.trigger_time)
+        trigger.set_trigger_time(np.datetime64('2021-01-01T00:00:12.2'))
+        rng = np.random.default_rng(1)
+        values = rng.poisson(1, (12000, self.ndom)).astype(np.uint16)
+        handlers = [AnalysisHandler(self.config, ndom=self.ndom, eps=np.linspace(0.9, 1.4, self.ndom),
+                                    start_time=np.datetime64('2021-01-01T00:00:00')) for _ in range(2)]
+        for value in values:
+            handlers[0].update(value)
+        # Uneven block boundaries exercise both partial and whole base bins
+        for block in np.split(values, [100, 700, 949, 2250, 9001]):
+            handlers[1].update_block(block)
+
+        npt.assert_array_equal(handlers[0].buffer_analysis.data, handlers[1].buffer_analysis.data)
+        npt.assert_array_equal(handlers[0]._accum_data, handlers[1]._accum_data)
+        self.assertEqual(handlers[0]._accum_count, handlers[1]._accum_count)
+        self.assertTrue(handlers[0].candidates)
+        self.assertEqual(len(handlers[0].candidates), len(handlers[1].candidates))
+        for ana0, ana1 in zip(*(handler.analyses for handler in handlers)):
+            npt.assert_array_equal(ana0.hit_sum2, ana1.hit_sum2)
+            self.assertEqual(ana0.n, ana1.n)
+
+    def test_process_triggers_primary(self):
+        """Primary trigger forms a candidate from the most significant analysis, and escalates only on higher xi
+        """
+        self.config._trigger_condition = PrimaryTrigger
+        rng = np.random.default_rng(2)
+        xi_cand = None
+        n_escalate = 0
+        # Excess passes through the search windows once it has crossed the leading background and exclusion windows
+        for lam in [200] * 2 + [400] + [200] * 3 + [600] + [200] * 30:
+            self.handler.buffer_analysis.append(rng.poisson(lam, self.ndom))
+            self.handler.update_analyses()
+            xi_max = max((ana.xi for ana in self.handler.analyses if PrimaryTrigger.check(ana)), default=None)
+            if xi_max is not None and (xi_cand is None or xi_max > xi_cand):
+                xi_cand = xi_max
+                n_escalate += 1
+            self.handler.process_triggers()
+
+        self.assertGreater(n_escalate, 1)
+        self.assertEqual(len(self.handler.candidates), 1)
+        self.assertEqual(self.handler.candidates[0].xi, xi_cand)
+        self.assertEqual(self.handler.trigger_count, n_escalate)
+
+    def test_eps_conversion(self):
+        """Integer, list and strided eps give the same results as the equivalent contiguous float eps
+        """
+        eps_int = np.ones(2 * self.ndom, dtype=int)
+        rng = np.random.default_rng(0)
+        values = rng.poisson(200, (72, self.ndom))
+        handlers = [AnalysisHandler(self.config, ndom=self.ndom, eps=eps,
+                                    start_time=np.datetime64('2021-01-01T00:00:00'))
+                    for eps in (np.ones(self.ndom), eps_int[:self.ndom], [1] * self.ndom, eps_int[::2])]
+        for value in values:
+            for handler in handlers:
+                handler.buffer_analysis.append(value)
+                handler.update_analyses()
+
+        for handler in handlers[1:]:
+            self.assertEqual(handler.eps.dtype, np.float64)
+            self.assertTrue(handler.eps.flags.c_contiguous)
+            for ana0, ana1 in zip(handlers[0].analyses, handler.analyses):
+                self.assertEqual(ana0.xi, ana1.xi)
+                self.assertEqual(ana0.chi2, ana1.chi2)
+
+    def test_get_buffered_xi(self):
+        """Buffered xi holds, for every base bin, the xi of the most recently updated analysis of each binsize
+        """
+        handler = AnalysisHandler(self.config, ndom=self.ndom, eps=np.linspace(0.9, 1.4, self.ndom),
+                                  start_time=np.datetime64('2021-01-01T00:00:00'))
+        rng = np.random.default_rng(1)
+        latest = dict.fromkeys(self.config.binsize_ms, 0.)
+        expected = {binsize: [] for binsize in latest}
+        for _ in range(72):
+            handler.buffer_analysis.append(rng.poisson(200, self.ndom))
+            handler.update_analyses()
+            for ana in handler.analyses:
+                if ana.n_accum == 0 and ana.is_online:
+                    latest[ana.binsize] = ana.xi
+            for binsize, xi in latest.items():
+                expected[binsize].append(xi)
+
+        for binsize in self.config.binsize_ms:
+            xi = handler.get_buffered_xi(binsize)
+            self.assertEqual(xi.size, 72)
+            self.assertTrue(np.any(xi != 0))
+            npt.assert_array_equal(xi, expected[binsize])
+
+    def test_update_results(self):
+        """Analysis results match direct evaluation from the sums
+        """
+        eps = self.handler.eps
+        for ana in self.handler.analyses:
+            self.assertTrue(ana.is_online)
+            signal = ana.rate - ana.mean
+            sum_inv_var = (eps * eps / ana.var).sum()
+            dmu = (signal * eps / ana.var).sum() / sum_inv_var
+            chi2 = ((ana.rate - (ana.mean + eps * signal))**2 / (ana.var + eps * abs(signal))).sum()
+            self.assertAlmostEqual(ana.dmu, dmu, delta=1e-9 * abs(dmu))
+            self.assertAlmostEqual(ana.var_dmu, 1. / sum_inv_var, delta=1e-9 / sum_inv_var)
+            self.assertAlmostEqual(ana.xi, dmu * np.sqrt(sum_inv_var), delta=1e-9 * abs(ana.xi))
+            self.assertAlmostEqual(ana.chi2, chi2, delta=1e-9 * chi2)
@@ -0,0 +1,223 @@
+import unittest
+import glob
+import os
+import struct
+import tempfile
+from types import SimpleNamespace
+import numpy as np
+import numpy.testing as npt
+from sndaq.datahandler import DataHandler, _rebin_scalers_kernel, _uniform_bin_index
+from sndaq.reader import SN_Payload, SN_MAGIC_NUMBER, SN_ENVELOPE_LENGTH
+from sndaq.util.rebin import rebin_scalers as c_rebin_scalers
+
+
+class TestRebinScalers(unittest.TestCase):
+
+    def setUp(self):
+        self.dh = DataHandler(ndom=4, livehost='localhost')
+        self.rng = np.random.default_rng(0)
+
+    def random_payload(self, nscaler=602):
+        """Random payload beginning within the first 100 bins of the staging buffer
+        """
+        self.dh._raw_utime = int(self.rng.integers(0, 10**12))
+        utime = self.dh._raw_utime + int(self.rng.integers(0, 100 * self.dh.raw_udt))
+        scalers = (self.rng.integers(1, 6, nscaler) * (self.rng.random(nscaler) < 0.3)).astype(np.uint8)
+        return utime, scalers
+
+    def dense(self, counts, idx):
+        """Rebinned scalers as a dense array of 2 ms bins
+        """
+        raw_counts = np.zeros(self.dh._staging_depth, dtype=np.int64)
+        np.add.at(raw_counts, np.asarray(idx, dtype=np.int64), np.asarray(counts, dtype=np.int64))
+        return raw_counts
+
+    def test_compare_cpp(self):
+        """Rebinned scalers match the C++ rebin
+        """
+        for _ in range(500):
+            utime, scalers = self.random_payload()
+            # The C++ rebin drops the part of the final scaler extending into the next 2 ms bin, so the payloads
+            #   compared end on an empty scaler
+            scalers[-1] = 0
+            npt.assert_array_equal(self.dense(*self.dh.rebin_scalers(utime, scalers)),
+                                   self.dense(*c_rebin_scalers(self.dh._raw_utime, utime, scalers.tobytes())))
+
+    def test_conserve_counts(self):
+        """Rebinning neither adds nor removes hits, including those of the final scaler
+        """
+        for _ in range(500):
+            utime, scalers = self.random_payload()
+            scalers[-1] = 5
+            counts, idx = self.dh.rebin_scalers(utime, scalers.tobytes())
+            self.assertEqual(counts.sum(), scalers.sum(dtype=np.int64))
+            self.assertTrue(np.all(np.diff(idx) > 0))
+
+    def test_clip(self):
+        """Scalers outside the staging buffer are added to its first or last bin, rather than wrapping around
+        """
+        nbins = self.dh._staging_depth
+        self.dh._raw_utime = 100 * self.dh.raw_udt
+        scalers = np.zeros(602, dtype=np.uint8)
+        scalers[0] = 3
+        scalers[-1] = 4
+
+        # Payload begins 5 bins before the staging buffer, so its first scaler would index bin -5
+        utime = self.dh._raw_utime - 5 * self.dh.raw_udt
+        raw_counts = self.dense(*self.dh.rebin_scalers(utime, scalers))
+        self.assertEqual(raw_counts[0], 3)
+        self.assertEqual(raw_counts[-1], 0)
+        self.assertEqual(raw_counts.sum(), 7)
+        # Matches the C++ rebin, which also begins counting from the first bin
+        scalers[-1] = 0
+        npt.assert_array_equal(self.dense(*self.dh.rebin_scalers(utime, scalers)),
+                               self.dense(*c_rebin_scalers(self.dh._raw_utime, utime, scalers.tobytes())))
+
+        # Payload ends past the back of the staging buffer
+        scalers[-1] = 4
+        utime = self.dh._raw_utime + nbins * self.dh.raw_udt - 10 * self.dh.scaler_udt
+        raw_counts = self.dense(*self.dh.rebin_scalers(utime, scalers))
+        self.assertEqual(raw_counts[-1], 4)
+        self.assertEqual(raw_counts.sum(), 7)
+
+    def test_empty(self):
+        """Payloads without hits produce no rebinned scalers
+        """
+        counts, idx = self.dh.rebin_scalers(self.dh._raw_utime, bytes(602))
+        self.assertEqual(counts.size, 0)
+        self.assertEqual(idx.size, 0)
+
+    def test_signatures(self):
+        """Both bytes and writable payload scalers use a signature compiled at import
+        """
+        signatures = list(_rebin_scalers_kernel.signatures)
+        self.assertEqual(len(signatures), 2)
+        utime, scalers = self.random_payload()
+        self.dh.rebin_scalers(utime, scalers)
+        self.dh.rebin_scalers(utime, scalers.tobytes())
+        self.assertEqual(_rebin_scalers_kernel.signatures, signatures)
+
+    def test_update_buffer(self):
+        """Rebinned scalers of the current payload are added to the staging buffer
+        """
+        utime, scalers = self.random_payload()
+        header = struct.pack(">QHH6B", 0x9486d3ddbece, 10 + scalers.size, SN_MAGIC_NUMBER, *bytes(6))
+        self.dh._pay = SN_Payload(utime, header + scalers.tobytes())
+        self.dh.update_buffer(2)
+        expected = self.dense(*self.dh.rebin_scalers(utime, scalers))
+        npt.assert_array_equal(self.dh._data[2], expected)
+        self.assertFalse(np.any(self.dh._data[[0, 1, 3]]))
+        self.assertEqual(self.dh._payloads_read[2], 1)
+
+
+class TestUniformBinIndex(unittest.TestCase):
+
+    def test_compare_searchsorted(self):
+        """Bin indices match searchsorted on the bin edges, clipped to the last bin
+        """
+        t0 = 1234567
+        dt = int(500e6)
+        nbins = 240
+        edges = np.arange(nbins) * dt
+        # Times on, and 1 ns either side of, every edge, including before the first and after the last
+        t = t0 + np.concatenate([edges - 1, edges, edges + 1, [-dt, nbins * dt, 5 * nbins * dt]])
+        t = np.append(t, t0 + np.random.default_rng(0).integers(-dt, (nbins + 1) * dt, 1000))
+        expected = np.minimum(edges.searchsorted(t - t0), nbins - 1)
+        npt.assert_array_equal(_uniform_bin_index(t, t0, dt, nbins), expected)
+
+
+class TestCandRmu(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.t_trigger = np.datetime64('2021-03-25T19:41:47.250', 'ns')
+        # One payload each 100 ms for 1 min, and one more long after the last bin edge
+        self.t = np.append(self.t_trigger + np.arange(-300, 300) * np.timedelta64(100, 'ms'),
+                           self.t_trigger + np.timedelta64(10, 'm'))
+        self.rmu = np.random.default_rng(0).integers(1, 100, self.t.size)
+        self.filename = os.path.join(self.tmpdir.name, 'pdaqtriggers_000001.dat')
+        with open(self.filename, 'w') as f:
+            for t, rmu in zip(self.t, self.rmu):
+                f.write(f"{str(t).replace('T', ' ')} {rmu}\n")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_get_cand_rmu(self):
+        """Muon rates are summed into 500 ms bins, with payloads after the last bin edge in the last bin
+        """
+        rebin_factor = 3
+        trigger = SimpleNamespace(t=self.t_trigger, binsize=500 * rebin_factor)
+        cand = SimpleNamespace(trigger=trigger, rmu_files=[self.filename], rmu_base=None, rmu_trigger=None)
+        DataHandler.get_cand_rmu(cand)
+
+        nbins = 2 * 60 * 2
+        rmu_base = cand.rmu_base * (rebin_factor * 0.5)
+        self.assertEqual(rmu_base.size, nbins)
+        self.assertEqual(cand.rmu_trigger.size, nbins)
+        self.assertAlmostEqual(rmu_base.sum(), self.rmu.sum())
+        self.assertAlmostEqual(rmu_base[-1], self.rmu[-1])
+
+
+class TestGetScalerFiles(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.run_number = 135790
+        self.dh = DataHandler(ndom=4, livehost='localhost', run_number=self.run_number)
+        self.t_start = np.datetime64('2021-03-25T19:00:00', 'ns')
+        scalers = bytes(602)
+        self.data = struct.pack(">QHH6B", 0x9486d3ddbece, 10 + len(scalers), SN_MAGIC_NUMBER, *bytes(6)) + scalers
+        # One file per minute, each holding a single payload at the start of the file
+        self.filenames = []
+        for idx in range(5):
+            filename = os.path.join(self.tmpdir.name, f'sn_{self.run_number}_{idx:06d}_0_0.dat')
+            self.write(filename, self.t_start + np.timedelta64(idx, 'm'))
+            self.filenames.append(filename)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def write(self, filename, t=None):
+        """Write an SN scaler file holding a single payload at time t, or an empty file if t is None
+        """
+        with open(filename, 'wb') as f:
+            if t is not None:
+                utime = 10 * (t - t.astype('datetime64[Y]')).astype(np.int64)
+                f.write(struct.pack(">iiq", SN_ENVELOPE_LENGTH + len(self.data), 16, utime) + self.data)
+
+    def get_scaler_files(self, t):
+        self.dh.get_scaler_files(self.tmpdir.name, t, buffer_time_l=60000, buffer_time_t=60000)
+        return list(self.dh.scaler_files)
+
+    def test_get_scaler_files(self):
+        """Files are selected within 2 min of the requested time
+        """
+        self.assertEqual(self.get_scaler_files(self.t_start + np.timedelta64(2, 'm')), self.filenames[1:4])
+
+    def test_compare_glob(self):
+        """Files found by the directory scan match those found by glob, in order
+        """
+        # Files from other runs, and with other extensions, are not matched
+        for name in (f'sn_{self.run_number + 1}_000002_0_0.dat', f'sn_{self.run_number}_000002_0_0.dat.gz',
+                     f'pdaqtriggers_{self.run_number}.dat'):
+            self.write(os.path.join(self.tmpdir.name, name), self.t_start)
+        # Every file falls within the search window
+        self.dh.get_scaler_files(self.tmpdir.name, self.t_start, buffer_time_l=600000, buffer_time_t=600000)
+        expected = sorted(glob.glob('/'.join((self.tmpdir.name, f'sn_{self.run_number}*.dat'))))
+        self.assertEqual(list(self.dh.scaler_files), expected)
+        self.assertEqual(expected, self.filenames)
+
+    def test_empty_first_file(self):
+        """Empty files are skipped when estimating file times
+        """
+        self.write(self.filenames[0])
+        self.assertEqual(self.get_scaler_files(self.t_start + np.timedelta64(2, 'm')), self.filenames[1:4])
+
+    def test_empty_files(self):
+        """A clear error is raised if no file holds a payload
+        """
+        for filename in self.filenames:
+            self.write(filename)
+        with self.assertRaisesRegex(RuntimeError, 'No SN scaler payloads found'):
+            self.get_scaler_files(self.t_start)
@@ -0,0 +1,86 @@
+import unittest
+import os
+import struct
+import tempfile
+import numpy as np
+import numpy.testing as npt
+from sndaq.reader import SN_Payload, SN_PayloadReader, SN_MAGIC_NUMBER, SN_ENVELOPE_LENGTH
+
+
+class TestSNPayload(unittest.TestCase):
+
+    def setUp(self):
+        self.utime = 278941064807639342
+        self.dom_id = 0x9486d3ddbece
+        self.clock_bytes = (0x01, 0x23, 0x45, 0x67, 0x89, 0xab)
+        self.scalers = np.random.default_rng(0).integers(0, 256, 602).astype(np.uint8)
+        self.data = struct.pack(">QHH6B", self.dom_id, 10 + self.scalers.size, SN_MAGIC_NUMBER,
+                                *self.clock_bytes) + self.scalers.tobytes()
+
+    def test_header(self):
+        """Payload header fields are read from bytes
+        """
+        pay = SN_Payload(self.utime, self.data)
+        self.assertEqual(pay.utime, self.utime)
+        self.assertEqual(pay.dom_id, self.dom_id)
+        self.assertEqual(pay.domclock, 0x0123456789ab)
+        self.assertEqual(pay.scaler_length, self.scalers.size)
+        self.assertEqual(pay.data_length, len(self.data))
+
+    def test_scalers(self):
+        """Payload scalers are a read-only uint8 view of the scaler bytes
+        """
+        pay = SN_Payload(self.utime, self.data)
+        self.assertEqual(pay.scalers.dtype, np.uint8)
+        self.assertFalse(pay.scalers.flags.writeable)
+        npt.assert_array_equal(pay.scalers, self.scalers)
+        self.assertEqual(pay.scalers.tobytes(), pay.scaler_bytes)
+
+    def test_no_data(self):
+        """Payloads constructed without data have no scalers
+        """
+        pay = SN_Payload(self.utime, self.data, keep_data=False)
+        self.assertIsNone(pay.scalers)
+        self.assertIsNone(pay.scaler_bytes)
+        self.assertEqual(pay.scaler_length, 0)
+
+    def test_str(self):
+        """Payload string representation
+        """
+        pay = SN_Payload(self.utime, self.data)
+        self.assertEqual(str(pay), "Supernova@278941064807639342[dom 9486d3ddbece clk 0123456789ab scalerData*602")
+
+
+class TestSNPayloadReader(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.tmpdir.name, 'sn_123456_000001.dat')
+        self.utimes = [278941064807639342, 278941064807639342 + 2**16 * 250 * 602]
+        scalers = np.arange(602, dtype=np.uint8)
+        data = struct.pack(">QHH6B", 0x9486d3ddbece, 10 + scalers.size, SN_MAGIC_NUMBER, *bytes(6)) + scalers.tobytes()
+        with open(self.filename, 'wb') as f:
+            for utime in self.utimes:
+                f.write(struct.pack(">iiq", SN_ENVELOPE_LENGTH + len(data), 16, utime) + data)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_read(self):
+        """Payloads are read from file
+        """
+        with SN_PayloadReader(self.filename) as rdr:
+            payloads = list(rdr)
+        self.assertEqual([pay.utime for pay in payloads], self.utimes)
+        npt.assert_array_equal(payloads[1].scalers, np.arange(602, dtype=np.uint8))
+
+    def test_peek_first_utime(self):
+        """Time of the first payload is read without decoding the file
+        """
+        self.assertEqual(SN_PayloadReader.peek_first_utime(self.filename), self.utimes[0])
+
+        # Empty files, or those ending within the first envelope, have no first payload
+        for contents in (b'', struct.pack(">iiq", 634, 16, self.utimes[0])[:10]):
+            with open(self.filename, 'wb') as f:
+                f.write(contents)
+            self.assertIsNone(SN_PayloadReader.peek_first_utime(self.filename))
@@ -0,0 +1,202 @@
+import unittest
+import json
+import os
+import tempfile
+import warnings
+from unittest import mock
+import requests
+from urllib3.exceptions import InsecureRequestWarning
+from sndaq import communication
+from sndaq.communication import RunInfoAgent, LiveMessageSender, query_live_json_view
+
+
+class TestQueryLive(unittest.TestCase):
+
+    def setUp(self):
+        self.url = 'https://i3live/run_info/'
+        self.session = mock.Mock()
+        self.response = self.session.post.return_value
+        self.response.json.return_value = {'run_number': 135790}
+        for name, value in (('_get_http_session', self.session), ('_get_encoded_credentials', 'user=me&pass=secret')):
+            patcher = mock.patch.object(communication, name, return_value=value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_query(self):
+        """Responses are decoded from JSON, and requests time out
+        """
+        self.assertEqual(query_live_json_view(self.url, {'run_number': 135790}), {'run_number': 135790})
+        self.assertEqual(self.session.post.call_args.args, (self.url,))
+        self.assertEqual(self.session.post.call_args.kwargs['timeout'], 10)
+        self.response.raise_for_status.assert_called_once()
+
+    def test_body(self):
+        """Parameters and credentials are posted as form data, and credentials are not logged
+        """
+        with self.assertLogs('pysndaq', level='DEBUG') as logs:
+            query_live_json_view(self.url, {'start': '2021-03-25 11:00:00', 'stop': '2021-03-25 19:00:00'})
+        self.assertEqual(self.session.post.call_args.kwargs['data'],
+                         'start=2021-03-25+11%3A00%3A00&stop=2021-03-25+19%3A00%3A00&user=me&pass=secret')
+        self.assertTrue(any('2021-03-25 11:00:00' in line for line in logs.output))
+        self.assertFalse(any('secret' in line or 'pass=' in line for line in logs.output))
+
+    def test_raise_for_status(self):
+        """HTTP errors are raised rather than decoded
+        """
+        self.response.raise_for_status.side_effect = requests.HTTPError('503 Server Error')
+        with self.assertRaises(requests.HTTPError):
+            query_live_json_view(self.url, {'run_number': 135790})
+        self.response.json.assert_not_called()
+
+    def test_timeout(self):
+        """Timeouts are raised to the caller
+        """
+        self.session.post.side_effect = requests.Timeout()
+        with self.assertRaises(requests.Timeout):
+            query_live_json_view(self.url, {'run_number': 135790})
+
+    def test_insecure_request_warning(self):
+        """Only warnings on unverified requests to I3Live are ignored
+        """
+        def warn(host):
+            warnings.warn_explicit(f"Unverified HTTPS request is being made to host '{host}'. ",
+                                   InsecureRequestWarning, 'connectionpool.py', 1, module='urllib3.connectionpool')
+
+        communication._ignore_insecure_request_warning.cache_clear()
+        self.addCleanup(communication._ignore_insecure_request_warning.cache_clear)
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            query_live_json_view(self.url, {'run_number': 135790})
+            warn('i3live')
+            warn('i3live.example.org')
+            warnings.warn("Unverified HTTPS request is being made to host 'i3live'. ", InsecureRequestWarning)
+        self.assertEqual(len(caught), 2)
+
+
+class TestRunInfoAgent(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        env = mock.patch.dict(os.environ, {'XDG_CACHE_HOME': self.tmpdir.name})
+        env.start()
+        self.addCleanup(env.stop)
+        self.addCleanup(setattr, RunInfoAgent, 'instance', None)
+        self.cache_dir = os.path.join(self.tmpdir.name, 'sndaq', 'run_info')
+        self.run_number = 135790
+        self.run_info = {'run_number': self.run_number, 'start': '2021-03-25 11:00:00', 'stop': '2021-03-25 19:00:00'}
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def agent(self, **kwargs):
+        return RunInfoAgent(host='localhost', force=True, **kwargs)
+
+    def query(self, return_value):
+        return mock.patch.object(communication, 'query_live_json_view', return_value=return_value)
+
+    def test_round_trip(self):
+        """Completed runs are requested once, then read from the on-disk cache
+        """
+        agent = self.agent()
+        self.assertEqual(agent.cache_dir, self.cache_dir)
+        with self.query(self.run_info) as query:
+            self.assertEqual(agent.get_run_info(self.run_number), self.run_info)
+            self.assertEqual(agent.get_run_info(self.run_number), self.run_info)
+        query.assert_called_once_with(agent.url, {'run_number': self.run_number})
+
+        # A new agent has an empty in-memory cache, so the run is read from disk
+        with self.query(None) as query:
+            self.assertEqual(self.agent().get_run_info(self.run_number), self.run_info)
+        query.assert_not_called()
+
+    def test_ongoing_run(self):
+        """Ongoing runs are not cached
+        """
+        run_info = dict(self.run_info, stop=None)
+        with self.query(run_info) as query:
+            self.agent().get_run_info(self.run_number)
+            self.agent().get_run_info(self.run_number)
+        self.assertEqual(query.call_count, 2)
+        self.assertFalse(os.path.exists(self.cache_dir))
+
+    def test_cache_dir(self):
+        """Cache directory may be overridden
+        """
+        cache_dir = os.path.join(self.tmpdir.name, 'other')
+        with self.query(self.run_info):
+            self.agent(cache_dir=cache_dir).get_run_info(self.run_number)
+        self.assertTrue(os.path.exists(os.path.join(cache_dir, f'{self.run_number}.json')))
+        self.assertFalse(os.path.exists(self.cache_dir))
+
+    def test_atomic_write(self):
+        """Cache files are moved into place once complete, and no partial files are left behind on failure
+        """
+        with self.query(self.run_info):
+            self.agent().get_run_info(self.run_number)
+        self.assertEqual(os.listdir(self.cache_dir), [f'{self.run_number}.json'])
+        with open(os.path.join(self.cache_dir, f'{self.run_number}.json')) as f:
+            self.assertEqual(json.load(f), self.run_info)
+
+        with self.query(dict(self.run_info, run_number=self.run_number + 1)), \
+                mock.patch.object(communication.os, 'replace', side_effect=OSError('Disk full')):
+            self.agent().get_run_info(self.run_number + 1)
+        self.assertEqual(os.listdir(self.cache_dir), [f'{self.run_number}.json'])
+
+    def test_corrupt_file(self):
+        """Cache files that cannot be decoded are ignored, removed, then replaced
+        """
+        os.makedirs(self.cache_dir)
+        path = os.path.join(self.cache_dir, f'{self.run_number}.json')
+        for contents in ('{"run_number": 1357', '[]'):
+            with open(path, 'w') as f:
+                f.write(contents)
+            self.assertIsNone(communication._load_run_info(self.cache_dir, self.run_number))
+            self.assertFalse(os.path.exists(path))
+
+        with open(path, 'w') as f:
+            f.write('{"run_number": 1357')
+        with self.query(self.run_info) as query:
+            self.assertEqual(self.agent().get_run_info(self.run_number), self.run_info)
+        query.assert_called_once()
+        with open(path) as f:
+            self.assertEqual(json.load(f), self.run_info)
+
+
+class TestLiveMessageSender(unittest.TestCase):
+
+    def setUp(self):
+        self.addCleanup(setattr, LiveMessageSender, 'instance', None)
+        self.sender = LiveMessageSender(msg={}, offline=True)
+        # The same message is updated and sent each time, so its status is recorded when it is sent
+        self.statuses = []
+        self.sender.sender = mock.Mock()
+        self.sender.sender.send_moni.side_effect = lambda varname, prio, value: self.statuses.append(value['status'])
+
+    def sent(self):
+        return self.statuses
+
+    def test_fra_status(self):
+        """Status updates return their error state, and QUEUED records the request ID
+        """
+        self.assertEqual(self.sender.fra_status('QUEUED', 'abc'), 0)
+        self.assertEqual(self.sender.request_id, 'abc')
+        self.assertEqual(self.sender.fra_status('FAIL', 'abc'), 1)
+        self.assertEqual(self.sender.request_id, 'abc')
+        with self.assertRaises(ValueError):
+            self.sender.fra_status('DONE', 'abc')
+        self.assertEqual(self.sent(), ['QUEUED', 'FAIL'])
+
+    def test_repeated_status(self):
+        """Only consecutive identical progress updates are suppressed
+        """
+        for status in ('QUEUED', 'QUEUED', 'IN PROGRESS', 'IN PROGRESS', 'SUCCESS', 'SUCCESS'):
+            self.sender.fra_status(status, 'abc')
+        self.assertEqual(self.sent(), ['QUEUED', 'IN PROGRESS', 'SUCCESS', 'SUCCESS'])
+
+        # A request is reported again once it has finished, or once another has been reported
+        self.sender.fra_status('IN PROGRESS', 'abc')
+        self.sender.fra_status('IN PROGRESS', 'def')
+        self.sender.fra_status('IN PROGRESS', 'abc')
+        self.sender.fra_result({}, 'abc')
+        self.sender.fra_status('IN PROGRESS', 'abc')
+        self.assertEqual(self.sent()[4:], ['IN PROGRESS'] * 3 + ['SUCCESS', 'IN PROGRESS'])